@@ -0,0 +1,317 @@
+from __future__ import annotations
+from Huffman import INTERNAL, BitWriter, Node, PACKED_HEADER
+
+# Symbol of the "not yet transmitted" leaf. Its code escapes the first occurrence
+# of every symbol, which follows in SYMBOL_BITS raw bits.
+NYT = "<NYT>"
+
+# Streams written by compress_stream start with this magic, followed by the coded
+# bytes and a trailer byte holding the number of valid bits in the last coded byte.
+STREAM_MAGIC = b"AHF\x01"
+
+# Default number of symbols read from the source per chunk by compress_stream.
+STREAM_CHUNK_SIZE = 1 << 16
+
+
+class AdaptiveNode(Node):
+    """
+    A node of the adaptive Huffman tree. On top of the Node fields, where
+    probability holds the weight, it links to its parent and stores its index
+    in the node list ordered by the sibling property.
+    """
+
+    def __init__(self, symbol, probability: int = 0, parent=None):
+        super().__init__(symbol, probability)
+        self.parent = parent
+        self.order = 0
+
+
+class AdaptiveHuffman:
+    """
+    A class representing the adaptive (FGK) Huffman algorithm.
+    Encoder and decoder start from a tree holding only the NYT leaf and update it
+    after every symbol in the same way, so coding is done in a single pass and the
+    tree is never transmitted. The model lives in the instance, use one instance
+    per direction and feed it the chunks of a stream in order.
+    """
+
+    # Raw size of a first occurrence, enough for any Unicode code point
+    SYMBOL_BITS = 21
+
+    def __init__(self):
+        self.nyt = AdaptiveNode(NYT)
+        self.root = self.nyt
+        # Nodes by decreasing implicit number, so weights never increase along it
+        self.nodes = [self.root]
+        self.leaves = dict()
+
+        # Decoder position, kept between calls so codes can span chunks
+        self._decode_node = self.root
+        self._raw_value = 0
+        self._raw_bits = 0
+
+    def encode(self, input: str) -> str:
+        """
+        Converts a string of text into a binary string, updating the model.
+        """
+        result = []
+        for symbol in input:
+            for code, length in self._encode_symbol(symbol):
+                if length:
+                    result.append(format(code, f"0{length}b"))
+        return "".join(result)
+
+    def decode(self, input: str):
+        """
+        Converts a binary string back into text, updating the model.
+        """
+        return self._join_symbols(self._decode_bits(bit == "1" for bit in input))
+
+    def encode_packed(self, input: str) -> bytes:
+        """
+        Converts a string of text into packed bytes in the format of
+        Huffman.encode_packed, updating the model.
+        """
+        out = bytearray(PACKED_HEADER.size)
+        writer = BitWriter(out)
+        self._write_symbols(input, writer)
+        bit_count = writer.finish() - PACKED_HEADER.size * 8
+        PACKED_HEADER.pack_into(out, 0, bit_count)
+        return bytes(out)
+
+    def decode_packed(self, input: bytes):
+        """
+        Converts packed bytes produced by encode_packed back into text, updating
+        the model.
+        """
+        if len(input) < PACKED_HEADER.size:
+            raise ValueError("Packed input is shorter than its header.")
+        (bit_count,) = PACKED_HEADER.unpack_from(input)
+        payload = memoryview(input)[PACKED_HEADER.size :]
+        if bit_count > len(payload) * 8:
+            raise ValueError("Packed input is truncated.")
+        return self._join_symbols(self._decode_bits(_bits(payload, bit_count)))
+
+    @classmethod
+    def compress_stream(cls, src, dst, chunk_size: int = STREAM_CHUNK_SIZE):
+        """
+        Compresses the file-like src into the binary file-like dst in a single
+        pass. Every chunk's whole bytes are written as soon as it's coded.
+        """
+        encoder = cls()
+        dst.write(STREAM_MAGIC)
+        writer = BitWriter()
+        last_bits = 0
+        while chunk := src.read(chunk_size):
+            encoder._write_symbols(chunk, writer)
+            if writer.out:
+                last_bits = 8
+                dst.write(writer.out)
+                writer.out = bytearray()
+
+        if writer.buffer_bits:
+            last_bits = writer.buffer_bits
+            writer.finish()
+            dst.write(writer.out)
+        dst.write(bytes([last_bits]))
+        return encoder
+
+    @classmethod
+    def decompress_stream(cls, src, dst, chunk_size: int = STREAM_CHUNK_SIZE):
+        """
+        Decompresses a stream written by compress_stream from the binary file-like
+        src into dst, writing out every chunk as soon as it's decoded.
+        """
+        if src.read(len(STREAM_MAGIC)) != STREAM_MAGIC:
+            raise ValueError("Input is not an adaptive Huffman stream.")
+
+        decoder = cls()
+        # The last two bytes are the final coded byte and the trailer
+        held = b""
+        while block := src.read(chunk_size):
+            held += block
+            if len(held) > 2:
+                body = memoryview(held)[:-2]
+                dst.write(
+                    decoder._join_symbols(
+                        decoder._decode_bits(_bits(body, len(body) * 8))
+                    )
+                )
+                held = held[-2:]
+
+        if not held or held[-1] > 8 or (len(held) == 1 and held[-1]):
+            raise ValueError("Adaptive Huffman stream is truncated.")
+        if len(held) == 2:
+            dst.write(
+                decoder._join_symbols(decoder._decode_bits(_bits(held[:1], held[-1])))
+            )
+        if decoder._decode_node is not decoder.root or decoder._raw_bits:
+            raise ValueError("Adaptive Huffman stream ends in the middle of a code.")
+        return decoder
+
+    def update(self, symbol) -> None:
+        """
+        Counts one more occurrence of symbol. A new symbol splits the NYT leaf into a
+        new NYT leaf and the symbol's leaf. Then, from the symbol's leaf up to the root,
+        every node is swapped with the leader of its block (the highest numbered node
+        of the same weight) before its weight is incremented, which keeps the sibling
+        property.
+        """
+        node = self.leaves.get(symbol)
+        if node is None:
+            parent = self.nyt
+            leaf = AdaptiveNode(symbol, 0, parent)
+            nyt = AdaptiveNode(NYT, 0, parent)
+            parent.symbol = INTERNAL
+            parent.left = nyt
+            parent.right = leaf
+            leaf.order = len(self.nodes)
+            self.nodes.append(leaf)
+            nyt.order = len(self.nodes)
+            self.nodes.append(nyt)
+            self.nyt = nyt
+            self.leaves[symbol] = leaf
+            node = leaf
+
+        nodes = self.nodes
+        while node is not None:
+            weight = node.probability
+            leader_order = node.order
+            while leader_order > 0 and nodes[leader_order - 1].probability == weight:
+                leader_order -= 1
+            leader = nodes[leader_order]
+            if leader is not node and leader is not node.parent:
+                self._swap(node, leader)
+            node.probability += 1
+            node = node.parent
+
+    def _swap(self, a: AdaptiveNode, b: AdaptiveNode) -> None:
+        """
+        Exchanges the positions of two subtrees in the tree and in the node order.
+        """
+        a_parent, b_parent = a.parent, b.parent
+        a_is_left = a_parent.left is a
+        b_is_left = b_parent.left is b
+        if a_is_left:
+            a_parent.left = b
+        else:
+            a_parent.right = b
+        if b_is_left:
+            b_parent.left = a
+        else:
+            b_parent.right = a
+        a.parent, b.parent = b_parent, a_parent
+
+        self.nodes[a.order], self.nodes[b.order] = b, a
+        a.order, b.order = b.order, a.order
+
+    def _code(self, node: AdaptiveNode) -> tuple[int, int]:
+        """
+        Returns the current (code, length) of node by walking up to the root.
+        """
+        code = 0
+        length = 0
+        while node.parent is not None:
+            if node.parent.right is node:
+                code |= 1 << length
+            length += 1
+            node = node.parent
+        return code, length
+
+    def _encode_symbol(self, symbol) -> list:
+        """
+        Returns the (code, length) pieces coding symbol and updates the model.
+        """
+        leaf = self.leaves.get(symbol)
+        if leaf is None:
+            pieces = [
+                self._code(self.nyt),
+                (self._symbol_value(symbol), self.SYMBOL_BITS),
+            ]
+        else:
+            pieces = [self._code(leaf)]
+        self.update(symbol)
+        return pieces
+
+    def _write_symbols(self, input, writer: BitWriter) -> None:
+        """
+        Codes input into the writer and flushes its whole bytes.
+        """
+        writer.write_all(
+            code_word for symbol in input for code_word in self._encode_symbol(symbol)
+        )
+        writer.flush()
+
+    def _decode_bits(self, bits) -> list:
+        """
+        Runs the decoder over an iterable of bits, returns the decoded symbols.
+        The position inside a code is kept for the next call.
+        """
+        result = []
+        node = self._decode_node
+        raw_value = self._raw_value
+        raw_bits = self._raw_bits
+        for bit in bits:
+            if node is self.nyt:
+                # Reading the raw bits of a new symbol
+                raw_value = (raw_value << 1) | bit
+                raw_bits += 1
+                if raw_bits < self.SYMBOL_BITS:
+                    continue
+                symbol = self._value_symbol(raw_value)
+                raw_value = 0
+                raw_bits = 0
+            else:
+                node = node.right if bit else node.left
+                if node is None:
+                    raise ValueError("Input holds an invalid code.")
+                if node is self.nyt or not node.is_leaf():
+                    continue
+                symbol = node.symbol
+
+            result.append(symbol)
+            self.update(symbol)
+            node = self.root
+
+        self._decode_node = node
+        self._raw_value = raw_value
+        self._raw_bits = raw_bits
+        return result
+
+    def _symbol_value(self, symbol) -> int:
+        return ord(symbol)
+
+    def _value_symbol(self, value: int):
+        return chr(value)
+
+    def _join_symbols(self, symbols: list):
+        return "".join(symbols)
+
+
+class AdaptiveByteHuffman(AdaptiveHuffman):
+    """
+    Adaptive Huffman coder over bytes, first occurrences take 8 raw bits.
+    """
+
+    SYMBOL_BITS = 8
+
+    def _symbol_value(self, symbol) -> int:
+        return symbol
+
+    def _value_symbol(self, value: int):
+        return value
+
+    def _join_symbols(self, symbols: list):
+        return bytes(symbols)
+
+
+def _bits(payload, bit_count: int):
+    """
+    Yields the first bit_count bits of payload, MSB first.
+    """
+    for byte in payload:
+        for shift in range(7, max(-1, 7 - bit_count), -1):
+            yield (byte >> shift) & 1
+        bit_count -= 8
+        if bit_count <= 0:
+            return
@@ -0,0 +1,140 @@
+from AdaptiveHuffman import AdaptiveByteHuffman, AdaptiveHuffman
+from Huffman import Huffman
+import io
+import random
+import string
+
+
+def check_sibling_property(coder: AdaptiveHuffman):
+    """
+    Weights never increase along the node order and siblings are adjacent in it.
+    """
+    nodes = coder.nodes
+    for i, node in enumerate(nodes):
+        assert node.order == i
+        if i:
+            assert nodes[i - 1].probability >= node.probability
+        if not node.is_leaf():
+            assert node.probability == node.left.probability + node.right.probability
+            assert abs(node.left.order - node.right.order) == 1
+
+
+def test_adaptive_round_trip():
+    text = "abracadabra"
+    encoded = AdaptiveHuffman().encode(text)
+    assert all(bit in "01" for bit in encoded)
+    assert AdaptiveHuffman().decode(encoded) == text
+
+
+def test_adaptive_packed_round_trip(n=100):
+    char_pool = string.ascii_letters + string.digits + " čšž"
+    for _ in range(n):
+        text = "".join(random.choice(char_pool) for _ in range(random.randint(0, 300)))
+        packed = AdaptiveHuffman().encode_packed(text)
+        assert AdaptiveHuffman().decode_packed(packed) == text
+
+
+def test_adaptive_sibling_property():
+    coder = AdaptiveHuffman()
+    for symbol in "mississippi river banks " * 5:
+        coder.update(symbol)
+        check_sibling_property(coder)
+    assert coder.root.probability == len("mississippi river banks ") * 5
+
+
+def test_adaptive_close_to_static_huffman():
+    """
+    On a long skewed input the one-pass code should approach the static one.
+    """
+    text = "".join(
+        random.choices("abcdefgh", weights=[40, 20, 10, 10, 8, 6, 4, 2], k=20000)
+    )
+    adaptive_bits = len(AdaptiveHuffman().encode(text))
+    static_bits = len(Huffman().encode(text))
+    assert adaptive_bits < 1.05 * static_bits
+
+
+def test_adaptive_chunks_continue_the_model():
+    """
+    Chunks fed one by one decode to the same text, even when a code spans chunks.
+    """
+    text = "the first byte goes out before the rest of the input arrives"
+    encoded = AdaptiveHuffman().encode(text)
+    decoder = AdaptiveHuffman()
+    decoded = "".join(
+        decoder.decode(encoded[i : i + 3]) for i in range(0, len(encoded), 3)
+    )
+    assert decoded == text
+
+
+def test_adaptive_stream_round_trip():
+    for text in ["", "a", "streaming " * 300]:
+        compressed = io.BytesIO()
+        AdaptiveHuffman.compress_stream(io.StringIO(text), compressed, chunk_size=7)
+        compressed.seek(0)
+        dst = io.StringIO()
+        AdaptiveHuffman.decompress_stream(compressed, dst, chunk_size=5)
+        assert dst.getvalue() == text
+
+
+def test_adaptive_stream_writes_before_end():
+    """
+    The compressed output grows while input is still being read.
+    """
+
+    class Source(io.StringIO):
+        def __init__(self, text, dst):
+            super().__init__(text)
+            self.dst = dst
+            self.sizes = []
+
+        def read(self, size=-1):
+            self.sizes.append(len(self.dst.getvalue()))
+            return super().read(size)
+
+    dst = io.BytesIO()
+    src = Source("live data " * 100, dst)
+    AdaptiveHuffman.compress_stream(src, dst, chunk_size=50)
+    assert src.sizes[1] > 4
+
+
+def test_adaptive_bytes_round_trip():
+    data = bytes(random.getrandbits(8) for _ in range(2000)) + b"\x00" * 500
+    packed = AdaptiveByteHuffman().encode_packed(data)
+    assert AdaptiveByteHuffman().decode_packed(packed) == data
+
+    compressed = io.BytesIO()
+    AdaptiveByteHuffman.compress_stream(io.BytesIO(data), compressed, chunk_size=64)
+    compressed.seek(0)
+    dst = io.BytesIO()
+    AdaptiveByteHuffman.decompress_stream(compressed, dst)
+    assert dst.getvalue() == data
+
+
+def test_adaptive_rejects_truncated_stream():
+    compressed = io.BytesIO()
+    AdaptiveHuffman.compress_stream(io.StringIO("truncate me"), compressed)
+    data = compressed.getvalue()
+    truncated = data[:-3] + data[-1:]
+    try:
+        AdaptiveHuffman.decompress_stream(io.BytesIO(truncated), io.StringIO())
+        assert False, "Truncated stream should be rejected"
+    except ValueError:
+        pass
+
+
+def main():
+    test_adaptive_round_trip()
+    test_adaptive_packed_round_trip(100)
+    test_adaptive_sibling_property()
+    test_adaptive_close_to_static_huffman()
+    test_adaptive_chunks_continue_the_model()
+    test_adaptive_stream_round_trip()
+    test_adaptive_stream_writes_before_end()
+    test_adaptive_bytes_round_trip()
+    test_adaptive_rejects_truncated_stream()
+    print("All adaptive Huffman tests passed.")
+
+
+if __name__ == "__main__":
+    main()
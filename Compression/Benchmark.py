@@ -0,0 +1,279 @@
+from AdaptiveHuffman import AdaptiveByteHuffman
+from Deflate import Deflate
+from Huffman import ByteHuffman, Huffman, byte_counts, np, read_varint, write_varint
+from LZ77 import LZ77
+import argparse
+import json
+import platform
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+
+def timed(function, *args, repeat: int = 3):
+    """
+    Returns the result of the call and the best wall time out of repeat runs.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def peak_memory(function, *args) -> int:
+    """
+    Returns the peak number of bytes allocated by the call, as seen by tracemalloc.
+    Kept apart from timed since tracing slows every allocation down.
+    """
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def make_corpus(size: int, seed: int = 0) -> dict:
+    """
+    Synthetic inputs of size bytes: uniform over 32 symbols, Zipf distributed
+    bytes, a single repeated symbol and random binary data (incompressible).
+    """
+    rng = random.Random(seed)
+    # Zipf's law over the byte values, weight of rank k is 1 / k
+    ranks = list(range(256))
+    rng.shuffle(ranks)
+    return {
+        "uniform": bytes(rng.choices(b"abcdefghijklmnopqrstuvwxyz012345", k=size)),
+        "zipf": bytes(
+            rng.choices(ranks, weights=[1 / (k + 1) for k in range(256)], k=size)
+        ),
+        "single": b"a" * size,
+        "binary": rng.randbytes(size),
+    }
+
+
+class HuffmanCodec:
+    """
+    Static byte Huffman: build counts the input and computes the code.
+    """
+
+    name = "huffman"
+
+    def build(self, data: bytes):
+        coder = ByteHuffman()
+        coder.build(byte_counts(data), canonical=True)
+        return coder
+
+    def encode(self, coder, data: bytes) -> bytes:
+        return self.with_header(coder, coder.encode_packed(data))
+
+    def decode(self, coder, compressed: bytes) -> bytes:
+        header_length, offset = read_varint(compressed, 0)
+        receiver = ByteHuffman.from_header(compressed[offset : offset + header_length])
+        return receiver.decode_packed(compressed[offset + header_length :])
+
+    @staticmethod
+    def with_header(coder, packed: bytes) -> bytes:
+        header = coder.to_header()
+        out = bytearray()
+        write_varint(out, len(header))
+        return bytes(out + header + packed)
+
+
+class NumPyHuffmanCodec(HuffmanCodec):
+    """
+    Static byte Huffman with the NumPy encoder.
+    """
+
+    name = "huffman-numpy"
+
+    def encode(self, coder, data: bytes) -> bytes:
+        return self.with_header(coder, coder.encode_packed_numpy(data))
+
+
+class AdaptiveHuffmanCodec:
+    """
+    One pass adaptive byte Huffman, the model is built while coding.
+    """
+
+    name = "adaptive-huffman"
+    build = None
+
+    def encode(self, _, data: bytes) -> bytes:
+        return AdaptiveByteHuffman().encode_packed(data)
+
+    def decode(self, _, compressed: bytes) -> bytes:
+        return AdaptiveByteHuffman().decode_packed(compressed)
+
+
+class LZ77Codec:
+    name = "lz77"
+    build = None
+
+    def encode(self, _, data: bytes) -> bytes:
+        return LZ77().compress(data)
+
+    def decode(self, _, compressed: bytes) -> bytes:
+        return LZ77().decompress(compressed)
+
+
+class DeflateCodec:
+    name = "deflate"
+    build = None
+
+    def encode(self, _, data: bytes) -> bytes:
+        return Deflate().compress(data)
+
+    def decode(self, _, compressed: bytes) -> bytes:
+        return Deflate().decompress(compressed)
+
+
+CODECS = [
+    HuffmanCodec,
+    NumPyHuffmanCodec,
+    AdaptiveHuffmanCodec,
+    LZ77Codec,
+    DeflateCodec,
+]
+
+
+def available_codecs() -> dict:
+    codecs = [codec() for codec in CODECS]
+    return {
+        codec.name: codec for codec in codecs if codec.name != "huffman-numpy" or np
+    }
+
+
+def benchmark_codec(codec, data: bytes, repeat: int = 3) -> dict:
+    """
+    Measures one codec on one input. Throughputs are in MB/s of uncompressed data,
+    the ratio is uncompressed over compressed size and the peak memory covers a
+    whole build, encode and decode round trip.
+    """
+    megabytes = len(data) / 1e6
+
+    def throughput(seconds: float):
+        return round(megabytes / seconds, 3) if seconds else None
+
+    coder, build_time = (None, None)
+    if codec.build is not None:
+        coder, build_time = timed(codec.build, data, repeat=repeat)
+    compressed, encode_time = timed(codec.encode, coder, data, repeat=repeat)
+    decoded, decode_time = timed(codec.decode, coder, compressed, repeat=repeat)
+    if decoded != data:
+        raise AssertionError(f"{codec.name} didn't round trip its input.")
+
+    def round_trip():
+        coder = codec.build(data) if codec.build is not None else None
+        codec.decode(coder, codec.encode(coder, data))
+
+    return {
+        "codec": codec.name,
+        "size": len(data),
+        "compressed_size": len(compressed),
+        "ratio": round(len(data) / len(compressed), 4),
+        "build_mb_s": throughput(build_time) if build_time is not None else None,
+        "encode_mb_s": throughput(encode_time),
+        "decode_mb_s": throughput(decode_time),
+        "peak_memory_bytes": peak_memory(round_trip),
+    }
+
+
+def run_suite(size: int = 1 << 18, repeat: int = 3, codecs=None, seed: int = 0) -> dict:
+    """
+    Runs every codec on every corpus, returns the results with the environment.
+    """
+    selected = available_codecs()
+    if codecs:
+        unknown = set(codecs) - selected.keys()
+        if unknown:
+            raise ValueError(f"Unknown codecs: {', '.join(sorted(unknown))}.")
+        selected = {name: selected[name] for name in codecs}
+
+    results = []
+    for corpus, data in make_corpus(size, seed).items():
+        for codec in selected.values():
+            result = benchmark_codec(codec, data, repeat)
+            result["corpus"] = corpus
+            results.append(result)
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "size": size,
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def print_report(report: dict, file=sys.stdout):
+    print(
+        f"{'corpus':<8} {'codec':<16} {'ratio':>8} {'build':>9} {'encode':>9} "
+        f"{'decode':>9} {'peak KiB':>10}",
+        file=file,
+    )
+    for result in report["results"]:
+        speeds = [result[f"{phase}_mb_s"] for phase in ("build", "encode", "decode")]
+        cells = " ".join("-".rjust(9) if s is None else f"{s:9.2f}" for s in speeds)
+        print(
+            f"{result['corpus']:<8} {result['codec']:<16} {result['ratio']:8.2f} "
+            f"{cells} {result['peak_memory_bytes'] / 1024:10.0f}",
+            file=file,
+        )
+    print("Throughput in MB/s of uncompressed data.", file=file)
+
+
+def benchmark_decode(size: int = 1_000_000, seed: int = 0):
+    """
+    Compares the table driven decode_packed against the bit by bit tree walk.
+    """
+    rng = random.Random(seed)
+    text = "".join(rng.choices(string.ascii_letters + " ", k=size))
+
+    h = Huffman()
+    packed = h.encode_packed(text)
+
+    table_result, table_time = timed(h.decode_packed, packed)
+    tree_result, tree_time = timed(h._decode_packed_tree, packed)
+    assert table_result == tree_result == text
+
+    megabytes = size / 1e6
+    print(f"Decoding {size} symbols ({len(packed)} packed bytes)")
+    print(f"  tree walk: {tree_time:.3f}s ({megabytes / tree_time:.2f} MB/s)")
+    print(f"  table:     {table_time:.3f}s ({megabytes / table_time:.2f} MB/s)")
+    print(f"  speedup:   {tree_time / table_time:.1f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compression benchmark suite.")
+    parser.add_argument("--size", type=int, default=1 << 18, help="bytes per corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per phase")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--codec", action="append", help="codec to run, repeatable")
+    parser.add_argument("--json", help="write the results as JSON to this path")
+    parser.add_argument(
+        "--decode-tables",
+        action="store_true",
+        help="compare the table decoder with the tree walk instead",
+    )
+    args = parser.parse_args(argv)
+
+    if args.decode_tables:
+        benchmark_decode(args.size, args.seed)
+        return
+
+    report = run_suite(args.size, args.repeat, args.codec, args.seed)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
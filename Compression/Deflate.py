@@ -0,0 +1,313 @@
+from __future__ import annotations
+from bisect import bisect_right
+from collections import Counter
+from Huffman import BitWriter, Huffman, read_varint, write_varint
+from LZ77 import LZ77
+
+# Compressed data starts with this magic, followed by the varint number of blocks
+# and the blocks, each one as the varint decompressed size, the varint body size
+# and the body written by Deflate.compress_block.
+DEFLATE_MAGIC = b"DFL\x01"
+
+# Default number of input bytes per independently coded block.
+BLOCK_SIZE = 1 << 16
+
+# Literal/length alphabet: byte values, the end of block marker, then length codes.
+END_OF_BLOCK = 256
+FIRST_LENGTH_CODE = 257
+
+# Coding words are limited so every symbol is resolved by one table probe.
+MAX_CODE_LENGTH = 15
+
+# Base value and number of extra bits of every length and distance code,
+# the same tables as DEFLATE (RFC 1951).
+LENGTH_BASES = [3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 15, 17, 19, 23, 27, 31, 35, 43, 51, 59, 67, 83, 99, 115, 131, 163, 195, 227, 258]  # fmt: skip
+LENGTH_EXTRA_BITS = [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4, 5, 5, 5, 5, 0]  # fmt: skip
+DISTANCE_BASES = [1, 2, 3, 4, 5, 7, 9, 13, 17, 25, 33, 49, 65, 97, 129, 193, 257, 385, 513, 769, 1025, 1537, 2049, 3073, 4097, 6145, 8193, 12289, 16385, 24577]  # fmt: skip
+DISTANCE_EXTRA_BITS = [0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6, 7, 7, 8, 8, 9, 9, 10, 10, 11, 11, 12, 12, 13, 13]  # fmt: skip
+
+# Largest distance the distance codes can express.
+MAX_DISTANCE = 32768
+
+
+class Deflate:
+    """
+    A class representing a DEFLATE-style codec: input is cut into blocks, every
+    block is tokenized by LZ77 and its literals, lengths and distances are coded
+    with canonical length limited Huffman codes. Blocks share nothing, so each
+    one can be compressed or decompressed on its own.
+    """
+
+    def __init__(
+        self, block_size: int = BLOCK_SIZE, window_size: int = MAX_DISTANCE, **lz77
+    ):
+        """
+        block_size is the number of input bytes per block, the remaining arguments
+        configure the LZ77 match finder.
+        """
+        if block_size < 1:
+            raise ValueError("Block size has to be positive.")
+        if window_size > MAX_DISTANCE:
+            raise ValueError(f"Window size can't exceed {MAX_DISTANCE}.")
+        self.block_size = block_size
+        self.lz77 = LZ77(window_size=window_size, **lz77)
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compresses data block by block into the container described by DEFLATE_MAGIC.
+        """
+        data = memoryview(bytes(data))
+        out = bytearray(DEFLATE_MAGIC)
+        starts = range(0, len(data), self.block_size)
+        write_varint(out, len(starts))
+        for start in starts:
+            block = data[start : start + self.block_size]
+            body = self.compress_block(block)
+            write_varint(out, len(block))
+            write_varint(out, len(body))
+            out += body
+        return bytes(out)
+
+    def decompress(self, data: bytes) -> bytes:
+        """
+        Converts data produced by compress back into the original bytes.
+        """
+        return b"".join(
+            self.decompress_block(body, size) for size, body in self.blocks(data)
+        )
+
+    def blocks(self, data: bytes):
+        """
+        Yields the (decompressed size, body) pair of every block in the container,
+        each body can be passed to decompress_block independently.
+        """
+        if bytes(data[: len(DEFLATE_MAGIC)]) != DEFLATE_MAGIC:
+            raise ValueError("Input is not a Deflate container.")
+        data = memoryview(data)
+        try:
+            block_count, offset = read_varint(data, len(DEFLATE_MAGIC))
+            for _ in range(block_count):
+                size, offset = read_varint(data, offset)
+                body_size, offset = read_varint(data, offset)
+                if offset + body_size > len(data):
+                    raise IndexError
+                yield size, data[offset : offset + body_size]
+                offset += body_size
+        except IndexError:
+            raise ValueError("Deflate container is truncated.") from None
+
+    def compress_block(self, block: bytes) -> bytes:
+        """
+        Codes one block: the literal/length and distance code headers (varint length
+        prefixed, see Huffman.to_header), then the coded tokens up to END_OF_BLOCK.
+        Length and distance codes are followed by their extra bits.
+        """
+        symbols = []
+        for token in self.lz77.tokenize(block):
+            if isinstance(token, int):
+                symbols.append((token, None))
+                continue
+            length, distance = token
+            length_code = LENGTH_CODES[length]
+            distance_code = bisect_right(DISTANCE_BASES, distance) - 1
+            symbols.append(
+                (
+                    FIRST_LENGTH_CODE + length_code,
+                    (
+                        length - LENGTH_BASES[length_code],
+                        LENGTH_EXTRA_BITS[length_code],
+                        distance_code,
+                        distance - DISTANCE_BASES[distance_code],
+                        DISTANCE_EXTRA_BITS[distance_code],
+                    ),
+                )
+            )
+        symbols.append((END_OF_BLOCK, None))
+
+        literals = _canonical_coder(Counter(symbol for symbol, _ in symbols))
+        distance_counts = Counter(match[2] for _, match in symbols if match)
+        distances = _canonical_coder(distance_counts) if distance_counts else None
+
+        out = bytearray()
+        for coder in (literals, distances):
+            header = coder.to_header() if coder else b""
+            write_varint(out, len(header))
+            out += header
+
+        literal_words = literals.code_words
+        distance_words = distances.code_words if distances else None
+
+        def code_words():
+            for symbol, match in symbols:
+                yield literal_words[symbol]
+                if match:
+                    (
+                        length_extra,
+                        length_bits,
+                        distance_code,
+                        distance_extra,
+                        distance_bits,
+                    ) = match
+                    yield length_extra, length_bits
+                    yield distance_words[distance_code]
+                    yield distance_extra, distance_bits
+
+        writer = BitWriter(out)
+        writer.write_all(code_words())
+        writer.finish()
+        return bytes(out)
+
+    def decompress_block(self, body: bytes, size: int | None = None) -> bytes:
+        """
+        Decodes one block written by compress_block. When size is given the result
+        has to be exactly that long.
+        """
+        try:
+            coders = []
+            offset = 0
+            for _ in range(2):
+                header_size, offset = read_varint(body, offset)
+                if offset + header_size > len(body):
+                    raise IndexError
+                coders.append(
+                    Huffman.from_header(body[offset : offset + header_size])
+                    if header_size
+                    else None
+                )
+                offset += header_size
+        except IndexError:
+            raise ValueError("Deflate block is truncated.") from None
+
+        literals, distances = coders
+        if literals is None:
+            raise ValueError("Deflate block has no literal/length code.")
+        for coder, alphabet_size in [
+            (literals, FIRST_LENGTH_CODE + len(LENGTH_BASES)),
+            (distances, len(DISTANCE_BASES)),
+        ]:
+            if coder is not None and not _valid_code(coder, alphabet_size):
+                raise ValueError("Deflate block holds an invalid code header.")
+        literal_symbols, literal_lengths = _probe_table(literals.code_words)
+        distance_symbols, distance_lengths = _probe_table(
+            distances.code_words if distances else {}
+        )
+        mask = (1 << MAX_CODE_LENGTH) - 1
+
+        # Zero padding lets the refill always read whole words
+        data = bytes(body[offset:]) + bytes(8)
+        end = (len(data) - 8) * 8
+        consumed = 0
+        position = 0
+        buffer = 0
+        buffer_bits = 0
+        out = bytearray()
+
+        while True:
+            if consumed > end:
+                raise ValueError("Deflate block is truncated.")
+            # Enough bits for a length code, a distance code and their extra bits
+            if buffer_bits < 48:
+                buffer = ((buffer & ((1 << buffer_bits) - 1)) << 64) | int.from_bytes(
+                    data[position : position + 8], "big"
+                )
+                position += 8
+                buffer_bits += 64
+
+            index = (buffer >> (buffer_bits - MAX_CODE_LENGTH)) & mask
+            symbol = literal_symbols[index]
+            code_length = literal_lengths[index]
+            if not code_length:
+                raise ValueError("Deflate block holds an invalid coding word.")
+            buffer_bits -= code_length
+            consumed += code_length
+
+            if symbol < END_OF_BLOCK:
+                out.append(symbol)
+                continue
+            if symbol == END_OF_BLOCK:
+                break
+
+            length_code = symbol - FIRST_LENGTH_CODE
+            extra_bits = LENGTH_EXTRA_BITS[length_code]
+            buffer_bits -= extra_bits
+            length = LENGTH_BASES[length_code] + (
+                (buffer >> buffer_bits) & ((1 << extra_bits) - 1)
+            )
+
+            index = (buffer >> (buffer_bits - MAX_CODE_LENGTH)) & mask
+            distance_code = distance_symbols[index]
+            code_length = distance_lengths[index]
+            if not code_length:
+                raise ValueError("Deflate block holds an invalid distance code.")
+            buffer_bits -= code_length
+            distance_extra = DISTANCE_EXTRA_BITS[distance_code]
+            buffer_bits -= distance_extra
+            distance = DISTANCE_BASES[distance_code] + (
+                (buffer >> buffer_bits) & ((1 << distance_extra) - 1)
+            )
+            consumed += extra_bits + code_length + distance_extra
+
+            if distance > len(out):
+                raise ValueError("Deflate block refers to data before its start.")
+            start = len(out) - distance
+            if distance >= length:
+                out += out[start : start + length]
+            else:
+                pattern = out[start:]
+                out += (pattern * (length // distance + 1))[:length]
+
+        if consumed > end:
+            raise ValueError("Deflate block is truncated.")
+        if size is not None and len(out) != size:
+            raise ValueError("Deflate block doesn't match its declared size.")
+        return bytes(out)
+
+
+def _length_codes() -> list:
+    """
+    Maps every match length from 3 to 258 to the index of its length code.
+    """
+    codes = [0] * (LENGTH_BASES[-1] + 1)
+    for code, base in enumerate(LENGTH_BASES):
+        for length in range(base, base + (1 << LENGTH_EXTRA_BITS[code])):
+            codes[length] = code
+    return codes
+
+
+LENGTH_CODES = _length_codes()
+
+
+def _canonical_coder(counts: Counter) -> Huffman:
+    coder = Huffman()
+    coder.build(counts, canonical=True, max_code_length=MAX_CODE_LENGTH)
+    return coder
+
+
+def _valid_code(coder: Huffman, alphabet_size: int) -> bool:
+    """
+    Whether every symbol of the coder is an integer below alphabet_size with a
+    coding word of at most MAX_CODE_LENGTH bits.
+    """
+    return all(
+        type(symbol) is int
+        and 0 <= symbol < alphabet_size
+        and length <= MAX_CODE_LENGTH
+        for symbol, (_, length) in coder.code_words.items()
+    )
+
+
+def _probe_table(code_words: dict) -> tuple[list, list]:
+    """
+    Builds the (symbols, lengths) tables indexed by the next MAX_CODE_LENGTH bits,
+    every coding word fills the entries starting with it. Length 0 marks bits that
+    don't start a coding word.
+    """
+    size = 1 << MAX_CODE_LENGTH
+    symbols = [None] * size
+    lengths = [0] * size
+    for symbol, (code, length) in code_words.items():
+        span = 1 << (MAX_CODE_LENGTH - length)
+        start = code << (MAX_CODE_LENGTH - length)
+        symbols[start : start + span] = [symbol] * span
+        lengths[start : start + span] = [length] * span
+    return symbols, lengths
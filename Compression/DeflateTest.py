@@ -0,0 +1,129 @@
+from Deflate import Deflate, LENGTH_BASES, MAX_CODE_LENGTH
+from Huffman import Huffman, read_varint, write_varint
+from LZ77 import LZ77
+import random
+
+
+def sample_text(size: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    words = [bytes(rng.choices(b"abcdefghij", k=rng.randint(2, 9))) for _ in range(300)]
+    return b" ".join(rng.choice(words) for _ in range(size // 6))[:size]
+
+
+def test_deflate_round_trip():
+    codec = Deflate()
+    for data in [b"", b"a", b"ab", b"aaa", b"\x00" * 5000, bytes(range(256)) * 3]:
+        assert codec.decompress(codec.compress(data)) == data
+
+    data = sample_text(200_000)
+    compressed = codec.compress(data)
+    assert codec.decompress(compressed) == data
+    # Beats both stages on their own
+    assert len(compressed) < len(LZ77().compress(data))
+    assert len(compressed) < len(data) // 3
+
+
+def test_deflate_all_lengths_and_distances():
+    """
+    Every length code and distance code with their extra bits survives a round trip.
+    """
+    rng = random.Random(3)
+    pieces = []
+    history = bytes(rng.getrandbits(8) for _ in range(32768))
+    pieces.append(history)
+    for length in range(3, LENGTH_BASES[-1] + 1):
+        distance = rng.randint(length, 32768)
+        start = len(history) - distance
+        pieces.append(history[start : start + length])
+    data = b"".join(pieces)
+
+    codec = Deflate(block_size=len(data))
+    assert codec.decompress(codec.compress(data)) == data
+
+
+def test_deflate_independent_blocks():
+    data = sample_text(50_000, seed=1)
+    codec = Deflate(block_size=8192)
+    compressed = codec.compress(data)
+    blocks = list(codec.blocks(compressed))
+    assert len(blocks) == 7
+
+    # Any block decodes on its own, in any order
+    start = 0
+    decoded = []
+    for size, body in blocks:
+        decoded.append((start, codec.decompress_block(body, size)))
+        start += size
+    for start, block in reversed(decoded):
+        assert block == data[start : start + len(block)]
+
+
+def test_deflate_code_lengths_limited():
+    """
+    Fibonacci-like counts would need long words, the block codes stay within the limit.
+    """
+    a, b = 1, 1
+    pieces = []
+    for symbol in range(30):
+        pieces.append(bytes([symbol]) * a)
+        a, b = b, a + b
+    data = bytes(random.Random(4).sample(b"".join(pieces), 100_000))
+
+    codec = Deflate(block_size=len(data))
+    ((size, body),) = codec.blocks(codec.compress(data))
+    header_size, offset = read_varint(body, 0)
+    literals = Huffman.from_header(body[offset : offset + header_size])
+    assert max(length for _, length in literals.code_words.values()) <= MAX_CODE_LENGTH
+    assert codec.decompress_block(body, size) == data
+
+
+def test_deflate_rejects_bad_input():
+    codec = Deflate()
+    compressed = codec.compress(sample_text(10_000, seed=2))
+    for bad in [b"", b"XXXX" + compressed[4:], compressed[:-10], compressed[:6]]:
+        try:
+            codec.decompress(bad)
+            assert False, "Invalid input should be rejected"
+        except ValueError:
+            pass
+
+    # Code headers with symbols outside the alphabets or of the wrong type
+    def block(literal_symbols, distance_symbols) -> bytes:
+        body = bytearray()
+        for symbols in (literal_symbols, distance_symbols):
+            coder = Huffman()
+            coder.build(symbols, [1] * len(symbols), canonical=True)
+            header = coder.to_header()
+            write_varint(body, len(header))
+            body += header
+        return bytes(body + bytes(8))
+
+    for literal_symbols, distance_symbols in [
+        ([65, 256, 286], [0, 1]),
+        ([65, 256, 257], [0, 30]),
+        (["a", "b"], [0, 1]),
+        ([65, 256], ["x", "y"]),
+    ]:
+        try:
+            codec.decompress_block(block(literal_symbols, distance_symbols))
+            assert False, "Invalid code headers should be rejected"
+        except ValueError:
+            pass
+
+    try:
+        Deflate(window_size=1 << 16)
+        assert False, "Window larger than the distance codes should be rejected"
+    except ValueError:
+        pass
+
+
+def main():
+    test_deflate_round_trip()
+    test_deflate_all_lengths_and_distances()
+    test_deflate_independent_blocks()
+    test_deflate_code_lengths_limited()
+    test_deflate_rejects_bad_input()
+
+
+if __name__ == "__main__":
+    main()
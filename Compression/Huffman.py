@@ -1,5 +1,67 @@
 from __future__ import annotations
-from collections import deque
+from collections import Counter, deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+import heapq
+import struct
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Packed streams start with the number of valid bits as an unsigned 64-bit
+# big-endian integer, the bits follow MSB first and the last byte is zero padded.
+PACKED_HEADER = struct.Struct(">Q")
+
+# Alphabets whose codes have more distinct prefixes than this decode a nibble
+# at a time instead of a byte at a time.
+DECODE_TABLE_MAX_STATES = 1024
+
+# The byte decoding table costs 256 entries per prefix, it is only built for
+# inputs with at least this many bytes per prefix.
+DECODE_BYTE_TABLE_RATIO = 16
+
+# Header flag set when every symbol is a single character, the symbols are then
+# stored as one UTF-8 string instead of length prefixed strings.
+HEADER_SINGLE_CHARACTERS = 0x01
+
+# Streams written by compress_stream start with this magic, followed by the
+# varint length of the coder header, the header itself and a sequence of packed
+# chunks (see PACKED_HEADER) terminated by a chunk of zero bits.
+STREAM_MAGIC = b"HUF\x01"
+
+# Default number of symbols read from the source per chunk by compress_stream.
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Symbol of internal tree nodes. Kept apart from every real symbol, "" included.
+INTERNAL = None
+
+# Header flag set when every symbol is a byte value, the symbols are then stored
+# as one byte each.
+HEADER_BYTE_SYMBOLS = 0x02
+
+# Header flag set when every symbol is a non-negative integer, the symbols are
+# then stored as varints.
+HEADER_INTEGER_SYMBOLS = 0x04
+
+# Output of compress_parallel starts with this magic, followed by the varint length
+# of the coder header, the header, the varint block size and block count, the
+# varint size of every block record and the records themselves. Every record is
+# a packed block (see PACKED_HEADER) decodable on its own with the shared header.
+PARALLEL_MAGIC = b"HUP\x01"
+
+# Default number of symbols per block of compress_parallel.
+PARALLEL_BLOCK_SIZE = 1 << 20
+
+# encode_packed_numpy places every coding word in one 64-bit word starting at its
+# byte, so together with the up to 7 bit offset inside that byte it has to fit.
+NUMPY_MAX_CODE_LENGTH = 57
+
+# Input bytes encoded per round by encode_packed_numpy, its temporary arrays take
+# about 64 bytes per input byte of a slice.
+NUMPY_SLICE_SIZE = 1 << 20
 
 
 class Node:
@@ -7,7 +69,7 @@ class Node:
     A class representing a single node.
     """
 
-    def __init__(self, symbol: str, probability: int, left=None, right=None):
+    def __init__(self, symbol, probability: int, left=None, right=None):
         self.symbol = symbol
         self.probability = probability
         self.left = left
@@ -16,6 +78,9 @@ class Node:
     def is_leaf(self):
         return self.left is None and self.right is None
 
+    def is_internal(self):
+        return self.symbol is INTERNAL
+
 
 class Huffman:
     """
@@ -25,28 +90,94 @@ class Huffman:
     def __init__(self):
         self.root = None
         self.coding_table = dict()
+        self.code_words = dict()
+        self.decoding_table = None
+        self.canonical = False
 
-    def build(self, symbols: list, probabilities: list):
+    @classmethod
+    def from_code_lengths(cls, code_lengths: dict) -> Huffman:
         """
-        Class method to generate Huffman tree based on sorted input of symbols and probabilites.
+        Creates a coder with canonical codes for the given symbol -> code length map.
+        Only the coding tables are set up, the tree is built on demand by decode.
+        """
+        huffman = cls()
+        huffman._assign_canonical_codes(code_lengths)
+        return huffman
+
+    @classmethod
+    def from_header(cls, header: bytes) -> Huffman:
         """
+        Creates a coder from a header written by to_header.
+        """
+        code_lengths, _ = cls._read_header(header, 0)
+        return cls.from_code_lengths(code_lengths)
+
+    def build(
+        self,
+        symbols,
+        probabilities: list | None = None,
+        canonical: bool = False,
+        max_code_length: int | None = None,
+    ):
+        """
+        Class method to generate Huffman tree based on symbols and their probabilities.
+        Symbols can be given as a list together with the list of probabilities, as a
+        symbol -> frequency mapping (dict, Counter), or as a sequence of frequencies
+        indexed by symbol (list, array) where symbols with zero frequency are skipped.
+        Input sorted by ascending probability is merged in linear time with two queues,
+        anything else goes through a heap.
+        With canonical set, the coding words are reassigned canonically from the code
+        lengths so the coder can be serialized with to_header.
+        With max_code_length set, no coding word is longer than max_code_length bits.
+        Trees exceeding it are replaced by the optimal length limited code found with
+        package-merge, which is always canonical.
+        """
+        symbols, probabilities = self._frequency_lists(symbols, probabilities)
         n = len(symbols)
-        leafs = deque(Node(symbols[i], probabilities[i]) for i in range(n))  # red queue
-        internal_nodes = deque()  # blue queue
+        if n == 0:
+            raise ValueError("Can't build a Huffman tree without any symbols.")
+        if max_code_length is not None and (
+            max_code_length < 1 or (1 << max_code_length) < n
+        ):
+            raise ValueError(
+                f"{n} symbols don't fit in codes of at most {max_code_length} bits."
+            )
 
-        if len(leafs) == 1:
+        if n == 1:
             # Create a dummy parent so the single node has a code (e.g., "0")
-            node = leafs.popleft()
-            self.root = Node("", node.probability, left=node)
-        else:
+            node = Node(symbols[0], probabilities[0])
+            self.root = Node(INTERNAL, node.probability, left=node)
+        elif all(a <= b for a, b in zip(probabilities, probabilities[1:])):
+            leafs = deque(
+                Node(symbols[i], probabilities[i]) for i in range(n)
+            )  # red queue
+            internal_nodes = deque()  # blue queue
             while len(leafs) + len(internal_nodes) > 1:
                 min1, min2 = self._pop_two_smallest(leafs, internal_nodes)
 
                 combined_prob = min1.probability + min2.probability
-                combined_node = Node("", combined_prob, min1, min2)
+                combined_node = Node(INTERNAL, combined_prob, min1, min2)
 
                 internal_nodes.append(combined_node)
             self.root = internal_nodes.popleft()
+        else:
+            # The counter breaks ties in insertion order so nodes are never compared
+            heap = [
+                (probabilities[i], i, Node(symbols[i], probabilities[i]))
+                for i in range(n)
+            ]
+            heapq.heapify(heap)
+            counter = n
+            while len(heap) > 1:
+                _, _, min1 = heapq.heappop(heap)
+                _, _, min2 = heapq.heappop(heap)
+
+                combined_prob = min1.probability + min2.probability
+                combined_node = Node(INTERNAL, combined_prob, min1, min2)
+
+                heapq.heappush(heap, (combined_prob, counter, combined_node))
+                counter += 1
+            self.root = heap[0][2]
 
         # We have to actually create a coding table.
         self.coding_table.clear()
@@ -56,7 +187,7 @@ class Huffman:
         while q:
             node, coding_word = q.popleft()
             # assert node is not None
-            if node.symbol:
+            if not node.is_internal():
                 self.coding_table[node.symbol] = coding_word
                 continue
             if node.left:
@@ -64,8 +195,90 @@ class Huffman:
             if node.right:
                 q.append((node.right, coding_word + "1"))
 
+        code_lengths = None
+        if max_code_length is not None and any(
+            len(code) > max_code_length for code in self.coding_table.values()
+        ):
+            code_lengths = dict(
+                zip(symbols, package_merge(probabilities, max_code_length))
+            )
+        elif canonical:
+            code_lengths = {
+                symbol: len(code) for symbol, code in self.coding_table.items()
+            }
+
+        if code_lengths is not None:
+            self._assign_canonical_codes(code_lengths)
+            self.root = self._build_tree_from_codes(dict(zip(symbols, probabilities)))
+            return self.root
+
+        # Integer form of the coding table used by the packed encoder.
+        self._update_code_words(
+            {
+                symbol: (int(code, 2), len(code))
+                for symbol, code in self.coding_table.items()
+            }
+        )
+        self.canonical = False
+
         return self.root
 
+    def to_header(self) -> bytes:
+        """
+        Serializes the canonical code lengths into a compact binary header:
+        a flags byte, the maximum code length, the number of symbols of every
+        length from 1 up to the maximum, then the symbols in canonical order.
+        All integers are LEB128 varints. Byte values are stored as one byte each,
+        other integer symbols as varints and strings in UTF-8.
+        """
+        if not self.canonical:
+            raise ValueError(
+                "Only canonical codes can be serialized, build with canonical=True."
+            )
+
+        order = self._canonical_order(
+            {symbol: length for symbol, (_, length) in self.code_words.items()}
+        )
+        max_length = order[-1][1] if order else 0
+        counts = [0] * (max_length + 1)
+        for _, length in order:
+            counts[length] += 1
+
+        integer_symbols = all(
+            isinstance(symbol, int) and symbol >= 0 for symbol, _ in order
+        )
+        byte_symbols = integer_symbols and all(symbol < 256 for symbol, _ in order)
+        if not integer_symbols and not all(isinstance(s, str) for s, _ in order):
+            raise ValueError("Only strings or non-negative integers can be serialized.")
+        single_characters = not integer_symbols and all(
+            len(symbol) == 1 for symbol, _ in order
+        )
+        if byte_symbols:
+            flags = HEADER_BYTE_SYMBOLS
+        elif integer_symbols:
+            flags = HEADER_INTEGER_SYMBOLS
+        elif single_characters:
+            flags = HEADER_SINGLE_CHARACTERS
+        else:
+            flags = 0
+        out = bytearray([flags])
+        write_varint(out, max_length)
+        for count in counts[1:]:
+            write_varint(out, count)
+        if byte_symbols:
+            out += bytes(symbol for symbol, _ in order)
+        elif integer_symbols:
+            for symbol, _ in order:
+                write_varint(out, symbol)
+        elif single_characters:
+            out += "".join(symbol for symbol, _ in order).encode("utf-8")
+        else:
+            for symbol, _ in order:
+                encoded = symbol.encode("utf-8")
+                write_varint(out, len(encoded))
+                out += encoded
+        return bytes(out)
+
     def encode(self, input: str):
         """
         Converts a string of text into a binary string using the generated tree.
@@ -74,7 +287,7 @@ class Huffman:
         if not input:
             return ""
 
-        if self.root is None:
+        if not self.coding_table:
             self._build_from_raw(input)
 
         result = ""
@@ -95,8 +308,11 @@ class Huffman:
         Converts a binary string back into text using the tree.
         """
 
+        if self.root is None and self.coding_table:
+            self.root = self._build_tree_from_codes()
+
         if not input or not self.root:
-            return ""
+            return self._join_symbols([])
 
         result = []
         current_node = self.root
@@ -113,16 +329,639 @@ class Huffman:
                 result.append(current_node.symbol)
                 current_node = self.root
 
-        return "".join(result)
+        return self._join_symbols(result)
+
+    def encode_packed(self, input: str, index_interval: int | None = None) -> bytes:
+        """
+        Converts a string of text into packed bytes using the generated tree.
+        The result holds PACKED_HEADER with the number of valid bits followed by
+        the coding words packed 8 bits per byte. With index_interval the bits are
+        followed by a checkpoint index, see decode_range.
+        """
+        if index_interval is not None and index_interval < 1:
+            raise ValueError("Index interval has to be positive.")
+
+        out = bytearray(PACKED_HEADER.size)
+        if not input:
+            PACKED_HEADER.pack_into(out, 0, 0)
+            if index_interval is not None:
+                self._write_index(out, 0, index_interval, [])
+            return bytes(out)
+
+        if not self.coding_table:
+            self._build_from_raw(input)
+
+        if index_interval is None:
+            segments = [input]
+        else:
+            segments = [
+                input[i : i + index_interval]
+                for i in range(0, len(input), index_interval)
+            ]
+
+        code_words = self._encoding_table()
+        checkpoints = []
+        writer = BitWriter(out)
+        for segment in segments:
+            checkpoints.append(writer.tell() - PACKED_HEADER.size * 8)
+            try:
+                writer.write_all(map(code_words.__getitem__, segment))
+            except (KeyError, TypeError, IndexError):
+                self._check_symbols(segment, code_words)
+                raise
+        bit_count = writer.finish() - PACKED_HEADER.size * 8
+
+        PACKED_HEADER.pack_into(out, 0, bit_count)
+        if index_interval is not None:
+            self._write_index(out, len(input), index_interval, checkpoints)
+        return bytes(out)
+
+    @staticmethod
+    def _check_symbols(input, code_words) -> None:
+        """
+        Raises ValueError for the first symbol of input without a coding word.
+        """
+        for char in input:
+            try:
+                code_word = code_words[char]
+            except (KeyError, TypeError, IndexError):
+                code_word = None
+            if code_word is None:
+                raise ValueError(
+                    f"Character '{char}' not found in coding table. Rebuild tree with all characters."
+                )
+
+    def decode_packed(self, input: bytes) -> str:
+        """
+        Converts packed bytes produced by encode_packed back into text.
+        Whole coding words are resolved per probe of the decoding table.
+        """
+
+        payload, bit_count = self._unpack(input)
+        if bit_count == 0 or not self.code_words:
+            return self._join_symbols([])
+
+        return self._join_symbols(self._decode_symbols(payload, bit_count))
+
+    def decode_range(self, input: bytes, start: int, stop: int):
+        """
+        Decodes the symbols start to stop (as in input[start:stop]) out of packed bytes
+        produced by encode_packed with an index_interval. Decoding begins at the last
+        checkpoint before start and ends at the first one after stop.
+        """
+        payload, bit_count = self._unpack(input)
+        symbol_count, interval, checkpoints = self._read_index(payload, bit_count)
+        start, stop, _ = slice(start, stop).indices(symbol_count)
+        if start >= stop or not self.code_words:
+            return self._join_symbols([])
+
+        first = start // interval
+        last = -(-stop // interval)
+        end = checkpoints[last] if last < len(checkpoints) else bit_count
+        symbols = self._decode_symbols(payload, end, checkpoints[first])
+        offset = first * interval
+        return self._join_symbols(symbols[start - offset : stop - offset])
+
+    @classmethod
+    def compress_stream(cls, src, dst, chunk_size: int = STREAM_CHUNK_SIZE) -> Huffman:
+        """
+        Compresses the seekable file-like src into the binary file-like dst while
+        holding at most one chunk of chunk_size symbols in memory. The first pass
+        counts the symbols chunk by chunk, the second one encodes every chunk into
+        an independently packed record. Returns the canonical coder that was used.
+        """
+        if not src.seekable():
+            raise ValueError("compress_stream reads src twice, it has to be seekable.")
+        start = src.tell()
+
+        frequencies = Counter()
+        while chunk := src.read(chunk_size):
+            cls._check_input(chunk)
+            frequencies.update(chunk)
+
+        dst.write(STREAM_MAGIC)
+        huffman = cls()
+        if not frequencies:
+            dst.write(bytes([0]))
+            dst.write(PACKED_HEADER.pack(0))
+            return huffman
+
+        huffman.build(frequencies, canonical=True)
+        header = huffman.to_header()
+        prefix = bytearray()
+        write_varint(prefix, len(header))
+        dst.write(prefix + header)
+
+        src.seek(start)
+        while chunk := src.read(chunk_size):
+            dst.write(huffman.encode_packed(chunk))
+        dst.write(PACKED_HEADER.pack(0))
+        return huffman
+
+    @classmethod
+    def decompress_stream(cls, src, dst) -> Huffman:
+        """
+        Decompresses a stream written by compress_stream from the binary file-like
+        src into dst, one chunk at a time. Returns the coder read from the stream.
+        """
+        if read_exact(src, len(STREAM_MAGIC)) != STREAM_MAGIC:
+            raise ValueError("Input is not a Huffman stream.")
+
+        header_length = 0
+        shift = 0
+        while True:
+            (byte,) = read_exact(src, 1)
+            header_length |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+
+        huffman = cls()
+        if header_length:
+            huffman = cls.from_header(read_exact(src, header_length))
+
+        while True:
+            record = read_exact(src, PACKED_HEADER.size)
+            (bit_count,) = PACKED_HEADER.unpack(record)
+            if bit_count == 0:
+                return huffman
+            record += read_exact(src, (bit_count + 7) >> 3)
+            dst.write(huffman.decode_packed(record))
+
+    @classmethod
+    def compress_parallel(
+        cls,
+        input: str,
+        block_size: int = PARALLEL_BLOCK_SIZE,
+        max_workers: int | None = None,
+    ) -> bytes:
+        """
+        Compresses input split into blocks of block_size symbols. Blocks are counted
+        and then encoded in a process pool, all of them with one canonical code built
+        from the merged counts. max_workers=1 does the work in this process.
+        """
+        if block_size < 1:
+            raise ValueError("Block size has to be positive.")
+        cls._check_input(input)
+        blocks = [input[i : i + block_size] for i in range(0, len(input), block_size)]
+
+        out = bytearray(PARALLEL_MAGIC)
+        if not blocks:
+            write_varint(out, 0)
+            write_varint(out, block_size)
+            write_varint(out, 0)
+            return bytes(out)
+
+        with _block_executor(max_workers, len(blocks)) as pool:
+            run = pool.map if pool else map
+            counts = list(run(_count_block, [cls] * len(blocks), blocks))
+            huffman = cls()
+            huffman.build(cls._merge_counts(counts), canonical=True)
+            header = huffman.to_header()
+            records = list(
+                run(_encode_block, [cls] * len(blocks), [header] * len(blocks), blocks)
+            )
+
+        write_varint(out, len(header))
+        out += header
+        write_varint(out, block_size)
+        write_varint(out, len(records))
+        for record in records:
+            write_varint(out, len(record))
+        for record in records:
+            out += record
+        return bytes(out)
+
+    @classmethod
+    def decompress_parallel(cls, data: bytes, max_workers: int | None = None):
+        """
+        Converts data produced by compress_parallel back into text, decoding the
+        blocks in a process pool.
+        """
+        header, _, spans = cls._read_block_index(data)
+        if not spans:
+            return cls()._join_symbols([])
+        records = [bytes(data[start:end]) for start, end in spans]
+        with _block_executor(max_workers, len(records)) as pool:
+            run = pool.map if pool else map
+            blocks = list(
+                run(
+                    _decode_block,
+                    [cls] * len(records),
+                    [header] * len(records),
+                    records,
+                )
+            )
+        return blocks[0][:0].join(blocks)
+
+    @classmethod
+    def decompress_block(cls, data: bytes, index: int):
+        """
+        Decodes only the block with the given index out of data produced by
+        compress_parallel, it holds the symbols starting at index * block size.
+        """
+        header, _, spans = cls._read_block_index(data)
+        if not 0 <= index < len(spans):
+            raise IndexError(f"Block {index} is out of range.")
+        start, end = spans[index]
+        return cls.from_header(header).decode_packed(bytes(data[start:end]))
+
+    @classmethod
+    def _read_block_index(cls, data: bytes) -> tuple[bytes, int, list]:
+        """
+        Parses the layout of PARALLEL_MAGIC, returns the coder header, the block size
+        and the (start, end) offsets of every block record.
+        """
+        if bytes(data[: len(PARALLEL_MAGIC)]) != PARALLEL_MAGIC:
+            raise ValueError("Input is not a parallel Huffman container.")
+        try:
+            header_length, offset = read_varint(data, len(PARALLEL_MAGIC))
+            header = bytes(data[offset : offset + header_length])
+            offset += header_length
+            block_size, offset = read_varint(data, offset)
+            block_count, offset = read_varint(data, offset)
+            sizes = []
+            for _ in range(block_count):
+                size, offset = read_varint(data, offset)
+                sizes.append(size)
+        except IndexError:
+            raise ValueError("Parallel Huffman container is truncated.") from None
+
+        spans = []
+        for size in sizes:
+            spans.append((offset, offset + size))
+            offset += size
+        if offset > len(data) or (block_count and len(header) != header_length):
+            raise ValueError("Parallel Huffman container is truncated.")
+        return header, block_size, spans
+
+    def _unpack(self, input: bytes) -> tuple[memoryview, int]:
+        """
+        Splits packed input into its payload and the number of valid bits.
+        """
+        if len(input) < PACKED_HEADER.size:
+            raise ValueError("Packed input is shorter than its header.")
+        (bit_count,) = PACKED_HEADER.unpack_from(input)
+        payload = memoryview(input)[PACKED_HEADER.size :]
+        if bit_count > len(payload) * 8:
+            raise ValueError("Packed input is truncated.")
+        return payload, bit_count
+
+    @staticmethod
+    def _write_index(
+        out: bytearray, symbol_count: int, interval: int, checkpoints: list
+    ) -> None:
+        """
+        Appends the checkpoint index to packed bytes: the varint symbol count and
+        interval, then the bit offset of every interval-th symbol as varint deltas.
+        """
+        write_varint(out, symbol_count)
+        write_varint(out, interval)
+        previous = 0
+        for checkpoint in checkpoints:
+            write_varint(out, checkpoint - previous)
+            previous = checkpoint
+
+    @staticmethod
+    def _read_index(payload, bit_count: int) -> tuple[int, int, list]:
+        """
+        Reads the index written by _write_index after the packed bits, returns the
+        symbol count, the interval and the checkpoint bit offsets.
+        """
+        offset = (bit_count + 7) >> 3
+        if offset >= len(payload):
+            raise ValueError("Packed input has no checkpoint index.")
+        try:
+            symbol_count, offset = read_varint(payload, offset)
+            interval, offset = read_varint(payload, offset)
+            checkpoints = []
+            position = 0
+            for _ in range(-(-symbol_count // max(interval, 1))):
+                delta, offset = read_varint(payload, offset)
+                position += delta
+                checkpoints.append(position)
+        except IndexError:
+            raise ValueError("Checkpoint index is truncated.") from None
+        if interval < 1 or position > bit_count:
+            raise ValueError("Checkpoint index is invalid.")
+        return symbol_count, interval, checkpoints
+
+    def _decode_symbols(self, payload, bit_count: int, start_bit: int = 0) -> list:
+        """
+        Table driven decoder returning the list of symbols held in bits start_bit
+        to bit_count of payload. start_bit has to be the start of a coding word.
+        """
+        if self.decoding_table is None:
+            self.decoding_table = self._build_decoding_table(self.code_words)
+        byte_table, nibble_table, bit_table = self.decoding_table
+
+        full_bytes = bit_count >> 3
+        if (
+            byte_table is None
+            and full_bytes - (start_bit >> 3)
+            >= DECODE_BYTE_TABLE_RATIO * len(bit_table)
+            and len(bit_table) <= DECODE_TABLE_MAX_STATES
+        ):
+            # Large enough input to pay for expanding the nibble table
+            byte_table = self._double_table(nibble_table, 4)
+            self.decoding_table = (byte_table, nibble_table, bit_table)
+
+        result = []
+        extend = result.extend
+        state = 0
+        position = start_bit >> 3
+
+        try:
+            if start_bit & 7:
+                # Bits of a checkpoint that doesn't start on a byte boundary
+                byte = payload[position]
+                last = min(8, bit_count - (position << 3))
+                for shift in range(7 - (start_bit & 7), 7 - last, -1):
+                    symbols, state = bit_table[state][(byte >> shift) & 1]
+                    extend(symbols)
+                position += 1
+
+            body = payload[position:full_bytes]
+            if byte_table is not None:
+                for byte in body:
+                    symbols, state = byte_table[state][byte]
+                    extend(symbols)
+            else:
+                for byte in body:
+                    symbols, state = nibble_table[state][byte >> 4]
+                    extend(symbols)
+                    symbols, state = nibble_table[state][byte & 15]
+                    extend(symbols)
+
+            if bit_count & 7 and full_bytes >= position:
+                byte = payload[full_bytes]
+                for shift in range(7, 7 - (bit_count & 7), -1):
+                    symbols, state = bit_table[state][(byte >> shift) & 1]
+                    extend(symbols)
+        except TypeError:
+            # Unpacking a None transition
+            raise ValueError("Packed input holds an invalid coding word.") from None
+
+        if state != 0:
+            raise ValueError("Packed input ends in the middle of a coding word.")
+        return result
+
+    @staticmethod
+    def _build_decoding_table(code_words: dict):
+        """
+        Builds the decoding automaton for the given coding words. Its states are the
+        proper prefixes of the coding words, state 0 being the empty prefix. Each table
+        maps a state and the next chunk of input (8, 4 or 1 bits) to the tuple of
+        decoded symbols and the following state, or to None for bits that don't start
+        any coding word. The byte table is left out (None) here, _decode_symbols builds
+        it once the input is long enough to pay for it.
+        """
+        states = {(0, 0): 0}
+        leaves = dict()
+        for symbol, (code, length) in code_words.items():
+            leaves[(code, length)] = symbol
+            for prefix_length in range(1, length):
+                prefix = (code >> (length - prefix_length), prefix_length)
+                if prefix not in states:
+                    states[prefix] = len(states)
+
+        bit_table = [[None, None] for _ in range(len(states))]
+        for (code, length), state in states.items():
+            for bit in (0, 1):
+                child = ((code << 1) | bit, length + 1)
+                if child in leaves:
+                    bit_table[state][bit] = ((leaves[child],), 0)
+                elif child in states:
+                    bit_table[state][bit] = ((), states[child])
+
+        nibble_table = Huffman._double_table(Huffman._double_table(bit_table, 1), 2)
+        return None, nibble_table, bit_table
+
+    @staticmethod
+    def _double_table(table: list, width: int) -> list:
+        """
+        Composes a decoding table over width bit chunks with itself, giving the
+        table over chunks of twice the width.
+        """
+        doubled = []
+        for row in table:
+            new_row = []
+            for high in row:
+                for low in range(1 << width):
+                    if high is None or table[high[1]][low] is None:
+                        new_row.append(None)
+                    else:
+                        symbols, state = table[high[1]][low]
+                        new_row.append((high[0] + symbols, state))
+            doubled.append(new_row)
+        return doubled
+
+    def _decode_packed_tree(self, input: bytes) -> str:
+        """
+        Bit by bit tree walk over packed input, kept as a reference for decode_packed.
+        """
+
+        payload, bit_count = self._unpack(input)
+        if bit_count == 0 or not self.root:
+            return self._join_symbols([])
+
+        result = []
+        root = self.root
+        current_node = root
+        remaining = bit_count
+        for byte in payload:
+            for shift in range(7, 7 - min(8, remaining), -1):
+                if (byte >> shift) & 1:
+                    current_node = current_node.right
+                else:
+                    current_node = current_node.left
+
+                if current_node.is_leaf():
+                    result.append(current_node.symbol)
+                    current_node = root
+            remaining -= 8
+            if remaining <= 0:
+                break
+
+        return self._join_symbols(result)
+
+    @staticmethod
+    def _canonical_order(code_lengths: dict) -> list:
+        """
+        Returns the (symbol, length) pairs sorted by code length, then by symbol.
+        """
+        return sorted(code_lengths.items(), key=lambda item: (item[1], item[0]))
+
+    def _assign_canonical_codes(self, code_lengths: dict) -> None:
+        """
+        Fills the coding tables with canonical codes for the given code lengths:
+        consecutive codes within a length, each length continuing from the shifted
+        successor of the last code of the previous one.
+        """
+        code = 0
+        previous_length = 0
+        code_words = dict()
+        for symbol, length in self._canonical_order(code_lengths):
+            if length < 1:
+                raise ValueError(
+                    f"Symbol {symbol!r} has an invalid code length {length}."
+                )
+            code <<= length - previous_length
+            if code >= 1 << length:
+                raise ValueError("Code lengths don't describe a prefix code.")
+            code_words[symbol] = (code, length)
+            code += 1
+            previous_length = length
+
+        self.root = None
+        self.coding_table = {
+            symbol: format(code, f"0{length}b")
+            for symbol, (code, length) in code_words.items()
+        }
+        self._update_code_words(code_words)
+        self.canonical = True
+
+    def _update_code_words(self, code_words: dict) -> None:
+        """
+        Installs the symbol -> (code, length) map used by the packed coders.
+        """
+        self.code_words = code_words
+        self.decoding_table = None
+
+    def _encoding_table(self):
+        """
+        Returns the lookup from input symbols to (code, length) used by encode_packed.
+        """
+        return self.code_words
+
+    def _join_symbols(self, symbols: list):
+        """
+        Assembles decoded symbols into the decoder output, a string when every
+        symbol is a string and the list of symbols otherwise.
+        """
+        if all(isinstance(symbol, str) for symbol in symbols):
+            return "".join(symbols)
+        return symbols
+
+    @classmethod
+    def _check_input(cls, input) -> None:
+        """
+        Rejects input the containers of compress_stream and compress_parallel can't
+        restore, their decoders write and join text.
+        """
+        if not isinstance(input, str):
+            raise ValueError(
+                f"Huffman compresses text, got {type(input).__name__}. "
+                "Use ByteHuffman for binary data."
+            )
+
+    def _build_tree_from_codes(self, probabilities: dict | None = None) -> Node:
+        """
+        Rebuilds the coding tree by following every coding word from the root.
+        Leaves take their probability from probabilities (0 when missing) and
+        internal nodes the sum of their leaves.
+        """
+        root = Node(INTERNAL, 0)
+        for symbol, code in self.coding_table.items():
+            probability = probabilities.get(symbol, 0) if probabilities else 0
+            node = root
+            for bit in code[:-1]:
+                node.probability += probability
+                if bit == "0":
+                    if node.left is None:
+                        node.left = Node(INTERNAL, 0)
+                    node = node.left
+                else:
+                    if node.right is None:
+                        node.right = Node(INTERNAL, 0)
+                    node = node.right
+            node.probability += probability
+            leaf = Node(symbol, probability)
+            if code[-1] == "0":
+                node.left = leaf
+            else:
+                node.right = leaf
+        return root
+
+    @staticmethod
+    def _read_header(data: bytes, offset: int) -> tuple[dict, int]:
+        """
+        Parses a header written by to_header starting at offset. Returns the
+        symbol -> code length map and the offset right after the header.
+        """
+        try:
+            flags = data[offset]
+            max_length, offset = read_varint(data, offset + 1)
+            counts = []
+            for _ in range(max_length):
+                count, offset = read_varint(data, offset)
+                counts.append(count)
+
+            code_lengths = dict()
+            if flags & HEADER_BYTE_SYMBOLS:
+                total = sum(counts)
+                if offset + total > len(data):
+                    raise ValueError("Huffman header is truncated.")
+                symbols = iter(bytes(data[offset : offset + total]))
+                offset += total
+            elif flags & HEADER_INTEGER_SYMBOLS:
+                symbols = []
+                for _ in range(sum(counts)):
+                    symbol, offset = read_varint(data, offset)
+                    symbols.append(symbol)
+                symbols = iter(symbols)
+            elif flags & HEADER_SINGLE_CHARACTERS:
+                total = sum(counts)
+                # UTF-8 characters take at most 4 bytes, find where the symbols end
+                text = bytes(data[offset : offset + 4 * total]).decode(
+                    "utf-8", errors="ignore"
+                )[:total]
+                if len(text) != total:
+                    raise ValueError("Huffman header is truncated.")
+                symbols = iter(text)
+                offset += len(text.encode("utf-8"))
+            else:
+                symbols = []
+                for _ in range(sum(counts)):
+                    size, offset = read_varint(data, offset)
+                    if offset + size > len(data):
+                        raise ValueError("Huffman header is truncated.")
+                    symbols.append(bytes(data[offset : offset + size]).decode("utf-8"))
+                    offset += size
+                symbols = iter(symbols)
+
+            for length, count in enumerate(counts, start=1):
+                for _ in range(count):
+                    code_lengths[next(symbols)] = length
+        except IndexError:
+            raise ValueError("Huffman header is truncated.") from None
+
+        return code_lengths, offset
 
     def _build_from_raw(self, input: str):
-        freq = {}
-        for ch in input:
-            freq[ch] = freq.get(ch, 0) + 1
+        self.build(self._count_symbols(input))
+
+    @staticmethod
+    def _count_symbols(input: str):
+        return Counter(input)
+
+    @staticmethod
+    def _merge_counts(counts: list):
+        return sum(counts, Counter())
 
-        symbols = sorted(freq.keys())
-        freqs = [freq[ch] for ch in symbols]
-        self.build(symbols, freqs)
+    @staticmethod
+    def _frequency_lists(symbols, probabilities: list | None) -> tuple[list, list]:
+        """
+        Normalizes the accepted build inputs into parallel symbol and probability lists.
+        """
+        if probabilities is not None:
+            if len(symbols) != len(probabilities):
+                raise ValueError("Every symbol needs exactly one probability.")
+            return list(symbols), list(probabilities)
+        if isinstance(symbols, Mapping):
+            return list(symbols.keys()), list(symbols.values())
+        indexed = [(i, count) for i, count in enumerate(symbols) if count]
+        return [i for i, _ in indexed], [count for _, count in indexed]
 
     def _pop_two_smallest(self, dq1: deque, dq2: deque):
         """
@@ -143,3 +982,346 @@ class Huffman:
         second = pop_smallest()
 
         return first, second
+
+
+class ByteHuffman(Huffman):
+    """
+    A Huffman coder over the fixed alphabet of the 256 byte values. Input and
+    output are bytes and the encoder looks coding words up in a 256 entry array.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.code_array = [None] * 256
+
+    @classmethod
+    def from_header(cls, header: bytes) -> ByteHuffman:
+        """
+        Same as Huffman.from_header, the header has to hold byte values only.
+        """
+        code_lengths, _ = cls._read_header(header, 0)
+        for symbol in code_lengths:
+            if not isinstance(symbol, int) or not 0 <= symbol < 256:
+                raise ValueError(f"Header symbol {symbol!r} is not a byte value.")
+        return cls.from_code_lengths(code_lengths)
+
+    def build(
+        self,
+        symbols,
+        probabilities: list | None = None,
+        canonical: bool = False,
+        max_code_length: int | None = None,
+    ):
+        """
+        Same as Huffman.build, symbols have to be byte values. The frequencies are
+        typically given as a sequence of 256 counts indexed by byte value.
+        """
+        symbols, probabilities = self._frequency_lists(symbols, probabilities)
+        for symbol in symbols:
+            if not isinstance(symbol, int) or not 0 <= symbol < 256:
+                raise ValueError(f"Symbol {symbol!r} is not a byte value.")
+        return super().build(symbols, probabilities, canonical, max_code_length)
+
+    def encode_packed_numpy(
+        self, input: bytes, slice_size: int = NUMPY_SLICE_SIZE
+    ) -> bytes:
+        """
+        Same output as encode_packed, computed with NumPy array operations. The bit
+        offset of every coding word is the cumulative sum of the code lengths, each
+        word is shifted into place inside a 64-bit word starting at its byte, words
+        starting in the same byte are ORed together and the bytes of the resulting
+        words are ORed into the output. The input is encoded slice_size bytes at a
+        time, which bounds the temporary arrays, the partial last byte of a slice is
+        carried into the next one. Requires NumPy, coders with coding words longer
+        than NUMPY_MAX_CODE_LENGTH fall back to encode_packed.
+        """
+        if np is None:
+            raise ImportError("encode_packed_numpy requires NumPy.")
+        if slice_size < 1:
+            raise ValueError("Slice size has to be positive.")
+        if not input:
+            return self.encode_packed(input)
+        if not self.coding_table:
+            self._build_from_raw(input)
+
+        lengths = np.zeros(256, dtype=np.int64)
+        codes = np.zeros(256, dtype=np.uint64)
+        for symbol, code_word in enumerate(self.code_array):
+            if code_word is not None:
+                codes[symbol], lengths[symbol] = code_word
+        if lengths.max() > NUMPY_MAX_CODE_LENGTH:
+            return self.encode_packed(input)
+        spanned = (int(lengths.max()) + 7 + 7) >> 3
+
+        data = np.frombuffer(input, dtype=np.uint8)
+        out = bytearray(PACKED_HEADER.size)
+        bit_count = 0
+        # Bits of the last byte already used and their value, carried between slices
+        phase = 0
+        partial = 0
+        for offset in range(0, len(data), slice_size):
+            chunk = data[offset : offset + slice_size]
+            word_lengths = lengths[chunk]
+            if not word_lengths.all():
+                missing = chunk[word_lengths == 0][0]
+                raise ValueError(
+                    f"Character '{missing}' not found in coding table. Rebuild tree with all characters."
+                )
+
+            ends = np.cumsum(word_lengths)
+            ends += phase
+            starts = ends - word_lengths
+            end = int(ends[-1])
+            byte_count = (end + 7) >> 3
+            bit_count += end - phase
+
+            # Coding word aligned inside the 64-bit word starting at its first byte
+            shifts = (64 - (starts & 7) - word_lengths).astype(np.uint64)
+            words = codes[chunk] << shifts
+            first_bytes = starts >> 3
+
+            # Words starting in the same byte don't overlap, OR them into one word
+            group_starts = np.flatnonzero(np.diff(first_bytes, prepend=-1))
+            words = np.bitwise_or.reduceat(words, group_starts)
+            first_bytes = first_bytes[group_starts]
+
+            # The word starting at every output byte, zero where no coding word starts
+            aligned = np.zeros(byte_count, dtype=np.uint64)
+            aligned[first_bytes] = words
+
+            packed = np.zeros(byte_count, dtype=np.uint8)
+            packed[0] = partial
+            for lane in range(min(spanned, byte_count)):
+                # Byte lane of the words that started lane bytes earlier
+                shift = np.uint64(56 - 8 * lane)
+                packed[lane:] |= (aligned[: byte_count - lane] >> shift).astype(
+                    np.uint8
+                )
+
+            phase = end & 7
+            if phase:
+                partial = int(packed[-1])
+                packed = packed[:-1]
+            else:
+                partial = 0
+            out += packed.tobytes()
+
+        if phase:
+            out.append(partial)
+        PACKED_HEADER.pack_into(out, 0, bit_count)
+        return bytes(out)
+
+    def _update_code_words(self, code_words: dict) -> None:
+        super()._update_code_words(code_words)
+        self.code_array = [None] * 256
+        for symbol, code_word in code_words.items():
+            self.code_array[symbol] = code_word
+
+    def _encoding_table(self):
+        return self.code_array
+
+    def _join_symbols(self, symbols: list):
+        return bytes(symbols)
+
+    @classmethod
+    def _check_input(cls, input) -> None:
+        if not isinstance(input, (bytes, bytearray, memoryview)):
+            raise ValueError(
+                f"ByteHuffman compresses bytes, got {type(input).__name__}. "
+                "Use Huffman for text."
+            )
+
+    @staticmethod
+    def _count_symbols(input: bytes):
+        return byte_counts(input)
+
+    @staticmethod
+    def _merge_counts(counts: list):
+        return [sum(column) for column in zip(*counts)]
+
+
+class BitWriter:
+    """
+    Packs coding words most significant bit first into a bytearray. Whole bytes
+    are flushed once the buffer grows past a machine word, the rest stays
+    buffered until finish pads it to a byte.
+    """
+
+    def __init__(self, out: bytearray | None = None):
+        self.out = bytearray() if out is None else out
+        self.buffer = 0
+        self.buffer_bits = 0
+
+    def write(self, code: int, length: int) -> None:
+        self.write_all(((code, length),))
+
+    def write_all(self, words) -> None:
+        """
+        Writes every (code, length) pair of the iterable words.
+        """
+        out = self.out
+        buffer = self.buffer
+        buffer_bits = self.buffer_bits
+        for code, length in words:
+            buffer = (buffer << length) | code
+            buffer_bits += length
+            if buffer_bits >= 64:
+                byte_count = buffer_bits >> 3
+                buffer_bits &= 7
+                out += (buffer >> buffer_bits).to_bytes(byte_count, "big")
+                buffer &= (1 << buffer_bits) - 1
+        self.buffer = buffer
+        self.buffer_bits = buffer_bits
+
+    def tell(self) -> int:
+        """
+        Number of bits in out plus the buffered ones.
+        """
+        return len(self.out) * 8 + self.buffer_bits
+
+    def flush(self) -> None:
+        """
+        Moves the whole bytes of the buffer to out, less than 8 bits stay buffered.
+        """
+        if self.buffer_bits >= 8:
+            byte_count = self.buffer_bits >> 3
+            self.buffer_bits &= 7
+            self.out += (self.buffer >> self.buffer_bits).to_bytes(byte_count, "big")
+            self.buffer &= (1 << self.buffer_bits) - 1
+
+    def finish(self) -> int:
+        """
+        Pads the buffered bits with zeros to a whole byte and moves them to out.
+        Returns the number of bits written before the padding.
+        """
+        bit_count = self.tell()
+        if self.buffer_bits:
+            padding = -self.buffer_bits % 8
+            self.buffer <<= padding
+            self.buffer_bits += padding
+            self.flush()
+        return bit_count
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    """
+    Appends value to out as an unsigned LEB128 varint.
+    """
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    """
+    Reads an unsigned LEB128 varint at offset, returns it and the next offset.
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def read_exact(src, size: int) -> bytes:
+    """
+    Reads exactly size bytes from the binary file-like src.
+    """
+    data = bytearray()
+    while len(data) < size:
+        block = src.read(size - len(data))
+        if not block:
+            raise ValueError("Stream is truncated.")
+        data += block
+    return bytes(data)
+
+
+def byte_counts(data: bytes) -> list[int]:
+    """
+    Returns the number of occurrences of every byte value in data, counted in one
+    pass.
+    """
+    if np is not None:
+        return np.bincount(np.frombuffer(data, np.uint8), minlength=256).tolist()
+    counts = [0] * 256
+    for value, count in Counter(data).items():
+        counts[value] = count
+    return counts
+
+
+# Coders rebuilt from a header by the block workers, reused by later blocks
+_worker_coders = dict()
+
+
+def _block_executor(max_workers: int | None, block_count: int):
+    """
+    Returns the process pool for the block workers, or a context holding None when
+    the work is done in this process.
+    """
+    if max_workers == 1 or block_count < 2:
+        return nullcontext()
+    return ProcessPoolExecutor(max_workers)
+
+
+def _worker_coder(coder_class, header: bytes) -> Huffman:
+    key = (coder_class, header)
+    coder = _worker_coders.get(key)
+    if coder is None:
+        _worker_coders.clear()
+        coder = _worker_coders[key] = coder_class.from_header(header)
+    return coder
+
+
+def _count_block(coder_class, block):
+    return coder_class._count_symbols(block)
+
+
+def _encode_block(coder_class, header: bytes, block) -> bytes:
+    return _worker_coder(coder_class, header).encode_packed(block)
+
+
+def _decode_block(coder_class, header: bytes, record: bytes):
+    return _worker_coder(coder_class, header).decode_packed(record)
+
+
+def package_merge(weights: list, max_length: int) -> list[int]:
+    """
+    Computes optimal code lengths of at most max_length bits for the given weights
+    with the package-merge algorithm. Every round pairs up the items of the previous
+    list into packages and merges them with the original leaves, the 2n - 2 lightest
+    items of the last list then give each symbol's code length as the number of
+    times it appears in them. Runs in O(n * max_length) after sorting.
+    """
+    n = len(weights)
+    if n == 1:
+        return [1]
+    if (1 << max_length) < n:
+        raise ValueError(
+            f"{n} symbols don't fit in codes of at most {max_length} bits."
+        )
+
+    # Items are (weight, symbol index, left item, right item), packages have index -1
+    leaves = sorted((weights[i], i, None, None) for i in range(n))
+    items = leaves
+    for _ in range(max_length - 1):
+        packages = [
+            (items[i][0] + items[i + 1][0], -1, items[i], items[i + 1])
+            for i in range(0, len(items) - 1, 2)
+        ]
+        items = list(heapq.merge(leaves, packages, key=lambda item: item[0]))
+
+    lengths = [0] * n
+    stack = items[: 2 * n - 2]
+    while stack:
+        _, index, left, right = stack.pop()
+        if index >= 0:
+            lengths[index] += 1
+        else:
+            stack.append(left)
+            stack.append(right)
+    return lengths
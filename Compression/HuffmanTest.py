@@ -1,4 +1,17 @@
-from Huffman import Huffman
+from Huffman import (
+    BitWriter,
+    ByteHuffman,
+    Huffman,
+    PACKED_HEADER,
+    byte_counts,
+    package_merge,
+)
+from collections import Counter
+from itertools import product
+import heapq
+import Huffman as huffman_module
+import io
+import pytest
 import random
 import string
 
@@ -35,7 +48,7 @@ def test_huffman_manual_build():
     symbols = ["A", "B", "C", "D", "E", "F"]
     freqs = [5, 9, 12, 13, 16, 45]
 
-    # Input MUST be sorted by frequency for the deque implementation to work
+    # Input sorted by frequency takes the linear two-queue path
     h.build(symbols, freqs)
 
     # Check properties of the resulting tree
@@ -130,6 +143,653 @@ def test_huffman_randomized(n=1000):
             raise e
 
 
+def test_huffman_packed_round_trip():
+    """
+    Tests that the packed encoding decodes back to the original text.
+    """
+    h = build_huffman()
+    original_text = "mississippi river"
+    packed = h.encode_packed(original_text)
+
+    assert isinstance(packed, bytes)
+    assert h.decode_packed(packed) == original_text
+
+
+def test_huffman_packed_matches_bit_string():
+    """
+    The packed payload must hold exactly the bits of the debugging string API.
+    """
+    h = build_huffman()
+    text = "abracadabra"
+    bits = h.encode(text)
+    packed = h.encode_packed(text)
+
+    (bit_count,) = PACKED_HEADER.unpack_from(packed)
+    assert bit_count == len(bits)
+    payload = packed[PACKED_HEADER.size :]
+    assert len(payload) == (len(bits) + 7) // 8
+    unpacked = "".join(f"{byte:08b}" for byte in payload)
+    assert unpacked[: len(bits)] == bits
+    assert set(unpacked[len(bits) :]) <= {"0"}
+
+
+def test_huffman_packed_is_smaller_than_input():
+    h = build_huffman()
+    text = "the quick brown fox jumps over the lazy dog " * 50
+    packed = h.encode_packed(text)
+
+    assert len(packed) < len(text.encode())
+    assert h.decode_packed(packed) == text
+
+
+def test_huffman_packed_edge_cases():
+    h = build_huffman()
+    assert h.decode_packed(h.encode_packed("")) == ""
+
+    h = build_huffman()
+    assert h.decode_packed(h.encode_packed("aaaaa")) == "aaaaa"
+
+    try:
+        h.decode_packed(b"\x00")
+        assert False, "Short input should be rejected"
+    except ValueError:
+        pass
+
+
+def test_huffman_packed_randomized(n=200):
+    char_pool = string.ascii_letters + string.digits + string.punctuation + " "
+
+    for _ in range(n):
+        length = random.randint(0, 300)
+        text = "".join(random.choice(char_pool) for _ in range(length))
+
+        h = build_huffman()
+        packed = h.encode_packed(text)
+        assert h.decode_packed(packed) == text, f"Mismatch on input: {text!r}"
+
+
+def test_huffman_table_decoder_long_codes():
+    """
+    Fibonacci frequencies produce coding words spanning several bytes,
+    which the decoding tables have to carry across chunk boundaries.
+    """
+    h = build_huffman()
+    symbols = [chr(ord("A") + i) for i in range(24)]
+    freqs = [1, 1]
+    while len(freqs) < len(symbols):
+        freqs.append(freqs[-1] + freqs[-2])
+    h.build(symbols, freqs)
+    assert max(len(code) for code in h.coding_table.values()) > 16
+
+    text = "".join(random.choice(symbols) for _ in range(2000)) + "AB"
+    packed = h.encode_packed(text)
+    assert h.decode_packed(packed) == text
+    assert h._decode_packed_tree(packed) == text
+
+
+def test_huffman_table_decoder_matches_tree_walk(n=100):
+    char_pool = string.ascii_letters + string.digits
+
+    for _ in range(n):
+        length = random.randint(1, 500)
+        text = "".join(random.choice(char_pool) for _ in range(length))
+
+        h = build_huffman()
+        packed = h.encode_packed(text)
+        assert h.decode_packed(packed) == h._decode_packed_tree(packed) == text
+
+
+def test_huffman_table_decoder_rejects_invalid_word():
+    h = build_huffman()
+    h.encode_packed("aaaa")
+    # The only coding word is "0", a set bit can't start any word
+    invalid = PACKED_HEADER.pack(1) + bytes([0b10000000])
+    try:
+        h.decode_packed(invalid)
+        assert False, "Invalid coding word should be rejected"
+    except ValueError:
+        pass
+
+
+def test_huffman_canonical_codes():
+    """
+    Canonical codes keep the code lengths of the tree and assign consecutive
+    coding words within each length, shorter lengths first.
+    """
+    symbols = ["A", "B", "C", "D", "E", "F"]
+    freqs = [5, 9, 12, 13, 16, 45]
+    h = build_huffman()
+    h.build(symbols, freqs)
+    canonical = build_huffman()
+    canonical.build(symbols, freqs, canonical=True)
+
+    for symbol in symbols:
+        assert len(h.coding_table[symbol]) == len(canonical.coding_table[symbol])
+
+    order = sorted(symbols, key=lambda s: (len(canonical.coding_table[s]), s))
+    codes = [canonical.coding_table[s] for s in order]
+    assert codes[0] == "0" * len(codes[0])
+    for previous, current in zip(codes, codes[1:]):
+        expected = (int(previous, 2) + 1) << (len(current) - len(previous))
+        assert int(current, 2) == expected
+
+    text = "FACEDFADEBFF"
+    assert canonical.decode(canonical.encode(text)) == text
+    assert canonical.decode_packed(canonical.encode_packed(text)) == text
+
+
+def test_huffman_header_round_trip():
+    text = "she sells sea shells by the sea shore"
+    h = build_huffman()
+    counts = {ch: text.count(ch) for ch in set(text)}
+    order = sorted(counts, key=lambda ch: counts[ch])
+    h.build(order, [counts[ch] for ch in order], canonical=True)
+
+    header = h.to_header()
+    packed = h.encode_packed(text)
+    receiver = Huffman.from_header(header)
+
+    assert receiver.coding_table == h.coding_table
+    assert receiver.decode_packed(packed) == text
+    # The debugging API rebuilds the tree on demand
+    assert receiver.decode(h.encode(text)) == text
+    # Flags, max length, one count per length and one byte per symbol
+    max_length = max(len(code) for code in h.coding_table.values())
+    assert len(header) == 2 + max_length + len(counts)
+
+
+def test_huffman_header_multi_character_symbols():
+    h = build_huffman()
+    h.build(["ab", "č", "xyz", "q"], [1, 2, 3, 4], canonical=True)
+    receiver = Huffman.from_header(h.to_header() + b"trailing payload")
+    assert len(receiver.coding_table) == 4
+    assert receiver.coding_table == h.coding_table
+
+
+def test_huffman_header_integer_symbols():
+    h = build_huffman()
+    h.build({0: 5, 256: 1, 300: 2, 70000: 3}, canonical=True)
+    receiver = Huffman.from_header(h.to_header())
+    assert receiver.code_words == h.code_words
+
+    h.build({1: 1, -2: 2}, canonical=True)
+    try:
+        h.to_header()
+        assert False, "Negative symbols should not be serialized"
+    except ValueError:
+        pass
+
+
+def test_huffman_header_requires_canonical():
+    h = build_huffman()
+    h.build(["a", "b"], [1, 2])
+    try:
+        h.to_header()
+        assert False, "Non canonical codes should not be serialized"
+    except ValueError:
+        pass
+
+
+def test_huffman_invalid_code_lengths():
+    try:
+        Huffman.from_code_lengths({"a": 1, "b": 1, "c": 1})
+        assert False, "Over-subscribed code lengths should be rejected"
+    except ValueError:
+        pass
+
+
+def optimal_cost(freqs) -> int:
+    """
+    Reference cost of an optimal prefix code, the sum of all merged weights.
+    """
+    if len(freqs) == 1:
+        return freqs[0]
+    heap = list(freqs)
+    heapq.heapify(heap)
+    cost = 0
+    while len(heap) > 1:
+        merged = heapq.heappop(heap) + heapq.heappop(heap)
+        cost += merged
+        heapq.heappush(heap, merged)
+    return cost
+
+
+def code_cost(h: Huffman, frequencies: dict) -> int:
+    return sum(len(h.coding_table[s]) * f for s, f in frequencies.items())
+
+
+def test_huffman_build_unsorted_is_optimal(n=200):
+    """
+    Any order of the input must give a code as short as the optimal one.
+    """
+    for _ in range(n):
+        size = random.randint(2, 40)
+        symbols = [chr(ord("a") + i) for i in range(size)]
+        freqs = [random.randint(1, 1000) for _ in range(size)]
+
+        h = build_huffman()
+        h.build(symbols, freqs)
+        assert code_cost(h, dict(zip(symbols, freqs))) == optimal_cost(freqs)
+
+
+def test_huffman_build_frequency_maps():
+    frequencies = {"x": 7, "y": 1, "z": 3, "w": 3}
+    expected = optimal_cost(list(frequencies.values()))
+
+    h = build_huffman()
+    h.build(frequencies)
+    assert code_cost(h, frequencies) == expected
+
+    h = build_huffman()
+    h.build(Counter("xxxxxxxyzzzwww"))
+    assert code_cost(h, frequencies) == expected
+
+    # Frequencies indexed by symbol, zero entries get no code
+    h = build_huffman()
+    h.build([0, 7, 0, 1, 3, 3])
+    assert set(h.coding_table) == {1, 3, 4, 5}
+    assert code_cost(h, {1: 7, 3: 1, 4: 3, 5: 3}) == expected
+
+    # Integer symbols decode to a list of symbols
+    symbols = [1, 3, 4, 5, 1, 1]
+    assert h.decode_packed(h.encode_packed(symbols)) == symbols
+    assert h.decode(h.encode(symbols)) == symbols
+    assert h.decode_packed(h.encode_packed([1, 3])) == [1, 3]
+
+
+def test_huffman_build_raw_is_optimal():
+    text = "abracadabra alakazam " * 3
+    h = build_huffman()
+    bits = h.encode(text)
+    assert len(bits) == optimal_cost(list(Counter(text).values()))
+
+
+def test_huffman_build_rejects_bad_input():
+    for args in [([],), (["a", "b"], [1])]:
+        try:
+            build_huffman().build(*args)
+            assert False, f"build{args} should be rejected"
+        except ValueError:
+            pass
+
+
+def test_huffman_decode_range():
+    text = "".join(random.choices("abcdefghijklmnop", weights=range(1, 17), k=5000))
+    h = build_huffman()
+    h.build(Counter(text), canonical=True)
+    packed = h.encode_packed(text, index_interval=64)
+    # The index is a trailer, plain decoding still works
+    assert h.decode_packed(packed) == text
+    assert len(packed) < len(h.encode_packed(text)) + 5000 // 64 * 2 + 8
+
+    for _ in range(200):
+        start = random.randint(0, len(text))
+        stop = random.randint(start, len(text))
+        assert h.decode_range(packed, start, stop) == text[start:stop]
+    assert h.decode_range(packed, -10, len(text) + 10) == text[-10:]
+    assert h.decode_range(packed, 30, 20) == ""
+
+    receiver = Huffman.from_header(h.to_header())
+    assert receiver.decode_range(packed, 1000, 1100) == text[1000:1100]
+
+
+def test_huffman_decode_range_edge_cases():
+    h = build_huffman()
+    h.build(["a", "b", "c"], [1, 1, 2])
+    for text in ["", "a", "abcabc"]:
+        packed = h.encode_packed(text, index_interval=1)
+        assert h.decode_range(packed, 0, len(text)) == text
+
+    try:
+        h.decode_range(h.encode_packed("abc"), 0, 1)
+        assert False, "Packed input without an index should be rejected"
+    except ValueError:
+        pass
+
+    try:
+        h.encode_packed("abc", index_interval=0)
+        assert False, "Empty index interval should be rejected"
+    except ValueError:
+        pass
+
+
+def test_huffman_stream_round_trip():
+    text = "".join(random.choice("abcdefgh \n") for _ in range(5000))
+    src = io.StringIO(text)
+    compressed = io.BytesIO()
+
+    coder = Huffman.compress_stream(src, compressed, chunk_size=333)
+    assert coder.canonical
+    assert len(compressed.getvalue()) < len(text)
+
+    compressed.seek(0)
+    dst = io.StringIO()
+    Huffman.decompress_stream(compressed, dst)
+    assert dst.getvalue() == text
+
+
+def test_huffman_stream_chunks_are_bounded():
+    """
+    Every chunk is packed independently, so no record exceeds one chunk's worth of codes.
+    """
+    text = "log line with some repeated content\n" * 400
+    compressed = io.BytesIO()
+    coder = Huffman.compress_stream(io.StringIO(text), compressed, chunk_size=1000)
+    longest = max(len(code) for code in coder.coding_table.values())
+
+    data = io.BytesIO(compressed.getvalue())
+    data.read(4)
+    header_length = data.read(1)[0]
+    data.read(header_length)
+    records = 0
+    while True:
+        (bit_count,) = PACKED_HEADER.unpack(data.read(PACKED_HEADER.size))
+        if bit_count == 0:
+            break
+        assert bit_count <= 1000 * longest
+        data.read((bit_count + 7) // 8)
+        records += 1
+    assert records == (len(text) + 999) // 1000
+
+
+def test_huffman_stream_edge_cases():
+    for text in ["", "z", "zzzz"]:
+        compressed = io.BytesIO()
+        Huffman.compress_stream(io.StringIO(text), compressed, chunk_size=2)
+        compressed.seek(0)
+        dst = io.StringIO()
+        Huffman.decompress_stream(compressed, dst)
+        assert dst.getvalue() == text
+
+    try:
+        Huffman.decompress_stream(io.BytesIO(b"nope"), io.StringIO())
+        assert False, "Foreign input should be rejected"
+    except ValueError:
+        pass
+
+    # Binary sources would write a stream the text decoder can't restore
+    try:
+        Huffman.compress_stream(io.BytesIO(b"log line"), io.BytesIO())
+        assert False, "Binary sources should be rejected"
+    except ValueError:
+        pass
+
+
+def test_huffman_empty_string_symbol():
+    """
+    The empty string is a valid symbol and must not be taken for an internal node.
+    """
+    h = build_huffman()
+    h.build(["", "a", "b"], [1, 2, 3])
+    assert set(h.coding_table) == {"", "a", "b"}
+    assert h.root is not None and h.root.is_internal()
+
+
+def test_byte_huffman_round_trip(n=50):
+    for _ in range(n):
+        data = bytes(
+            random.choice(b"\x00\x01\xff ab") for _ in range(random.randint(1, 400))
+        )
+        h = ByteHuffman()
+        packed = h.encode_packed(data)
+        assert h.decode_packed(packed) == data
+        assert h.decode(h.encode(data)) == data
+
+    h = ByteHuffman()
+    assert h.decode_packed(h.encode_packed(b"")) == b""
+    h = ByteHuffman()
+    assert h.decode_packed(h.encode_packed(b"\x07" * 9)) == b"\x07" * 9
+
+
+def test_bit_writer():
+    words = [(random.getrandbits(length), length) for length in range(0, 40)] * 5
+    writer = BitWriter()
+    writer.write(1, 1)
+    writer.write_all(words)
+    bits = "1" + "".join(
+        format(code, f"0{length}b") if length else "" for code, length in words
+    )
+    assert writer.tell() == len(bits)
+
+    writer.flush()
+    assert writer.buffer_bits == len(bits) % 8
+    assert writer.finish() == len(bits)
+    padded = bits + "0" * (-len(bits) % 8)
+    assert writer.out == int(padded, 2).to_bytes(len(padded) // 8, "big")
+    assert BitWriter().finish() == 0
+
+
+def test_byte_counts_with_and_without_numpy():
+    data = bytes(random.choices(range(200), k=5000)) + b"\xff"
+    expected = [Counter(data)[value] for value in range(256)]
+    assert byte_counts(data) == expected
+    assert byte_counts(b"") == [0] * 256
+
+    numpy = huffman_module.np
+    huffman_module.np = None
+    try:
+        assert byte_counts(data) == expected
+        assert byte_counts(bytearray(data)) == expected
+    finally:
+        huffman_module.np = numpy
+
+
+def test_byte_huffman_uses_byte_arrays():
+    data = bytes(range(256)) + b"\x00" * 1000
+    h = ByteHuffman()
+    h.build(byte_counts(data))
+
+    assert len(h.code_array) == 256
+    assert all(entry is not None for entry in h.code_array)
+    assert h.code_array[0][1] == 1
+    assert h.decode_packed(h.encode_packed(data)) == data
+
+    try:
+        h.build({"a": 1, "b": 2})
+        assert False, "Non byte symbols should be rejected"
+    except ValueError:
+        pass
+
+
+def test_byte_huffman_header_and_stream():
+    data = bytes(random.getrandbits(3) * 30 for _ in range(3000))
+    compressed = io.BytesIO()
+    coder = ByteHuffman.compress_stream(io.BytesIO(data), compressed, chunk_size=256)
+
+    header = coder.to_header()
+    receiver = ByteHuffman.from_header(header)
+    assert receiver.code_array == coder.code_array
+    assert len(header) <= 2 + 8 + 8
+
+    # Headers of text or wide integer symbols aren't byte codes
+    for symbols in ["ab", [1, 300]]:
+        text_coder = Huffman()
+        text_coder.build(symbols, [1, 2], canonical=True)
+        try:
+            ByteHuffman.from_header(text_coder.to_header())
+            assert False, "Non byte symbols should be rejected"
+        except ValueError:
+            pass
+
+    compressed.seek(0)
+    dst = io.BytesIO()
+    ByteHuffman.decompress_stream(compressed, dst)
+    assert dst.getvalue() == data
+
+
+def test_byte_huffman_numpy_encoder_matches_scalar():
+    pytest.importorskip("numpy")
+    for size in [1, 7, 8, 9, 1000, 100_000]:
+        data = bytes(random.choices(range(256), weights=range(1, 257), k=size))
+        coder = ByteHuffman()
+        coder.build(byte_counts(data), canonical=random.random() < 0.5)
+        assert coder.encode_packed_numpy(data) == coder.encode_packed(data)
+
+    # Long coding words of a skewed distribution span many bytes
+    coder = ByteHuffman()
+    coder.build(fibonacci_frequencies(40))
+    data = bytes(range(40)) * 10
+    packed = coder.encode_packed_numpy(data)
+    assert packed == coder.encode_packed(data)
+    assert coder.decode_packed(packed) == data
+    assert coder.encode_packed_numpy(b"") == coder.encode_packed(b"")
+
+    try:
+        coder.encode_packed_numpy(b"\xff")
+        assert False, "Bytes missing from the code should be rejected"
+    except ValueError:
+        pass
+
+
+def test_byte_huffman_numpy_encoder_slices():
+    pytest.importorskip("numpy")
+    data = bytes(random.choices(range(256), weights=range(1, 257), k=5000))
+    coder = ByteHuffman()
+    coder.build(byte_counts(data))
+    expected = coder.encode_packed(data)
+    # Slices ending inside a byte carry the partial byte into the next one
+    for slice_size in [1, 2, 3, 7, 8, 333, 4999, 5000, 10_000]:
+        assert coder.encode_packed_numpy(data, slice_size) == expected
+    assert coder.encode_packed_numpy(bytearray(data), 64) == expected
+
+    coder = ByteHuffman()
+    coder.build(fibonacci_frequencies(40))
+    data = bytes(range(40)) * 10
+    assert coder.encode_packed_numpy(data, 5) == coder.encode_packed(data)
+
+    try:
+        coder.encode_packed_numpy(data, 0)
+        assert False, "Empty slices should be rejected"
+    except ValueError:
+        pass
+
+
+def fibonacci_frequencies(n: int) -> list:
+    freqs = [1, 1]
+    while len(freqs) < n:
+        freqs.append(freqs[-1] + freqs[-2])
+    return freqs[:n]
+
+
+def test_huffman_length_limited_codes():
+    """
+    Limiting a skewed distribution bounds the code lengths at a small cost in
+    average code length compared to the unconstrained tree.
+    """
+    symbols = [chr(ord("A") + i) for i in range(20)]
+    freqs = fibonacci_frequencies(20)
+    frequencies = dict(zip(symbols, freqs))
+
+    unconstrained = build_huffman()
+    unconstrained.build(symbols, freqs)
+    assert max(len(code) for code in unconstrained.coding_table.values()) == 19
+
+    previous_cost = code_cost(unconstrained, frequencies)
+    for limit in range(18, 4, -1):
+        h = build_huffman()
+        h.build(symbols, freqs, max_code_length=limit)
+        lengths = [len(code) for code in h.coding_table.values()]
+        assert max(lengths) <= limit
+        assert sum(2.0**-length for length in lengths) == 1.0
+
+        cost = code_cost(h, frequencies)
+        assert cost >= previous_cost
+        previous_cost = cost
+
+        text = "".join(random.choice(symbols) for _ in range(500))
+        assert h.decode_packed(h.encode_packed(text)) == text
+        assert h.decode(h.encode(text)) == text
+
+
+def test_huffman_length_limit_not_reached():
+    """
+    A limit the tree already satisfies keeps the optimal code.
+    """
+    symbols = ["A", "B", "C", "D", "E", "F"]
+    freqs = [5, 9, 12, 13, 16, 45]
+    h = build_huffman()
+    h.build(symbols, freqs, max_code_length=8)
+    assert code_cost(h, dict(zip(symbols, freqs))) == optimal_cost(freqs)
+
+
+def test_package_merge_is_optimal(n=100):
+    """
+    Compares package-merge with an exhaustive search over all length vectors.
+    """
+    for _ in range(n):
+        size = random.randint(2, 6)
+        limit = random.randint(3, 4)
+        weights = [random.randint(1, 50) for _ in range(size)]
+
+        best = min(
+            sum(w * l for w, l in zip(weights, lengths))
+            for lengths in product(range(1, limit + 1), repeat=size)
+            if sum(2.0**-l for l in lengths) <= 1.0
+        )
+        lengths = package_merge(weights, limit)
+        assert max(lengths) <= limit
+        assert sum(2.0**-l for l in lengths) <= 1.0
+        assert sum(w * l for w, l in zip(weights, lengths)) == best
+
+
+def test_huffman_length_limit_too_small():
+    try:
+        build_huffman().build(
+            ["a", "b", "c", "d", "e"], [1, 1, 1, 1, 1], max_code_length=2
+        )
+        assert False, "Five symbols can't have 2 bit codes"
+    except ValueError:
+        pass
+
+
+def test_huffman_parallel_round_trip():
+    text = "".join(random.choices("abcdefgh ", weights=range(1, 10), k=50_000))
+    compressed = Huffman.compress_parallel(text, block_size=4096, max_workers=2)
+    # Blocks share one code, so the pool doesn't change the output
+    assert compressed == Huffman.compress_parallel(text, 4096, max_workers=1)
+    assert Huffman.decompress_parallel(compressed, max_workers=2) == text
+    assert Huffman.decompress_parallel(compressed, max_workers=1) == text
+
+    data = bytes(random.getrandbits(4) for _ in range(20_000))
+    compressed = ByteHuffman.compress_parallel(data, block_size=3000, max_workers=2)
+    assert ByteHuffman.decompress_parallel(compressed, max_workers=2) == data
+
+
+def test_huffman_parallel_block_index():
+    text = "".join(random.choices(string.ascii_lowercase, k=10_000))
+    compressed = Huffman.compress_parallel(text, block_size=1000, max_workers=1)
+    for index in [9, 0, 4]:
+        block = Huffman.decompress_block(compressed, index)
+        assert block == text[index * 1000 : (index + 1) * 1000]
+
+    try:
+        Huffman.decompress_block(compressed, 10)
+        assert False, "Block index past the end should be rejected"
+    except IndexError:
+        pass
+
+
+def test_huffman_parallel_edge_cases():
+    for text in ["", "a", "aaaa"]:
+        compressed = Huffman.compress_parallel(text, block_size=2)
+        assert Huffman.decompress_parallel(compressed) == text
+
+    compressed = Huffman.compress_parallel("abcabcabc", block_size=2, max_workers=1)
+    for bad in [b"", compressed[:-1], compressed[:8], b"HUF" + compressed[3:]]:
+        try:
+            Huffman.decompress_parallel(bad, max_workers=1)
+            assert False, "Invalid input should be rejected"
+        except ValueError:
+            pass
+
+    for coder_class, data in [(Huffman, b"abc"), (ByteHuffman, "abc")]:
+        try:
+            coder_class.compress_parallel(data, max_workers=1)
+            assert False, "Input of the wrong type should be rejected"
+        except ValueError:
+            pass
+
+
 def main():
     test_huffman_basic_round_trip()
     test_huffman_manual_build()
@@ -137,6 +797,44 @@ def main():
     test_huffman_empty_string()
     test_huffman_textbook_mississippi()
     test_huffman_randomized(1000)
+    test_huffman_packed_round_trip()
+    test_huffman_packed_matches_bit_string()
+    test_huffman_packed_is_smaller_than_input()
+    test_huffman_packed_edge_cases()
+    test_huffman_packed_randomized(200)
+    test_huffman_table_decoder_long_codes()
+    test_huffman_table_decoder_matches_tree_walk(100)
+    test_huffman_table_decoder_rejects_invalid_word()
+    test_huffman_canonical_codes()
+    test_huffman_header_round_trip()
+    test_huffman_header_multi_character_symbols()
+    test_huffman_header_integer_symbols()
+    test_huffman_header_requires_canonical()
+    test_huffman_invalid_code_lengths()
+    test_huffman_build_unsorted_is_optimal(200)
+    test_huffman_build_frequency_maps()
+    test_huffman_build_raw_is_optimal()
+    test_huffman_build_rejects_bad_input()
+    test_huffman_decode_range()
+    test_huffman_decode_range_edge_cases()
+    test_huffman_stream_round_trip()
+    test_huffman_stream_chunks_are_bounded()
+    test_huffman_stream_edge_cases()
+    test_huffman_empty_string_symbol()
+    test_byte_huffman_round_trip(50)
+    test_bit_writer()
+    test_byte_counts_with_and_without_numpy()
+    test_byte_huffman_uses_byte_arrays()
+    test_byte_huffman_header_and_stream()
+    test_byte_huffman_numpy_encoder_matches_scalar()
+    test_byte_huffman_numpy_encoder_slices()
+    test_huffman_length_limited_codes()
+    test_huffman_length_limit_not_reached()
+    test_package_merge_is_optimal(100)
+    test_huffman_length_limit_too_small()
+    test_huffman_parallel_round_trip()
+    test_huffman_parallel_block_index()
+    test_huffman_parallel_edge_cases()
     print("All Huffman tests passed.")
 
 
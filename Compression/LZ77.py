@@ -0,0 +1,214 @@
+from __future__ import annotations
+import struct
+
+# Shortest match worth a back reference, also the length of the hashed prefix.
+MIN_MATCH = 3
+
+# Longest match a single token can hold in the serialized format.
+MAX_MATCH = MIN_MATCH + 255
+
+# Largest distance the serialized format can hold.
+MAX_WINDOW = 1 << 16
+
+# Compressed data starts with the decompressed size as an unsigned 64-bit
+# big-endian integer.
+LZ77_HEADER = struct.Struct(">Q")
+
+
+class LZ77:
+    """
+    A class representing the LZ77 dictionary coder.
+    Input is split into tokens: a literal byte (int) or a back reference
+    (length, distance) copying length bytes starting distance bytes back.
+    Matches are found through hash chains over the sliding window: every
+    position is linked to the previous one starting with the same MIN_MATCH
+    bytes, so only candidates sharing the prefix are ever compared.
+    """
+
+    def __init__(
+        self, window_size: int = 32768, lookahead: int = MAX_MATCH, max_chain: int = 32
+    ):
+        """
+        window_size bounds the distance of a back reference, lookahead the length
+        of a match and max_chain the number of candidates tried per position,
+        which trades speed for compression ratio.
+        """
+        if not 1 <= window_size <= MAX_WINDOW:
+            raise ValueError(f"Window size has to be between 1 and {MAX_WINDOW}.")
+        if not MIN_MATCH <= lookahead <= MAX_MATCH:
+            raise ValueError(
+                f"Lookahead has to be between {MIN_MATCH} and {MAX_MATCH}."
+            )
+        if max_chain < 1:
+            raise ValueError("At least one candidate has to be tried per position.")
+        self.window_size = window_size
+        self.lookahead = lookahead
+        self.max_chain = max_chain
+
+    def tokenize(self, data: bytes) -> list:
+        """
+        Greedily splits data into literals and the longest back references found.
+        """
+        data = bytes(data)
+        n = len(data)
+        window_size = self.window_size
+        lookahead = self.lookahead
+        max_chain = self.max_chain
+
+        # head maps a hashed prefix to its latest position, prev links a position
+        # (modulo the window size) to the previous one with the same prefix
+        head = dict()
+        prev = [-1] * window_size
+        tokens = []
+        last_hashable = n - MIN_MATCH
+
+        def insert(position: int) -> None:
+            key = data[position : position + MIN_MATCH]
+            prev[position % window_size] = head.get(key, -1)
+            head[key] = position
+
+        position = 0
+        while position < n:
+            best_length = 0
+            best_distance = 0
+            if position <= last_hashable:
+                limit = min(lookahead, n - position)
+                candidate = head.get(data[position : position + MIN_MATCH], -1)
+                chain = 0
+                while (
+                    candidate >= 0
+                    and position - candidate <= window_size
+                    and chain < max_chain
+                ):
+                    # Only a candidate extending past the best match can beat it
+                    if (
+                        best_length < limit
+                        and data[candidate + best_length]
+                        == data[position + best_length]
+                    ):
+                        length = _match_length(data, candidate, position, limit)
+                        if length > best_length:
+                            best_length = length
+                            best_distance = position - candidate
+                            if length == limit:
+                                break
+                    candidate = prev[candidate % window_size]
+                    chain += 1
+
+            if best_length >= MIN_MATCH:
+                tokens.append((best_length, best_distance))
+                end = min(position + best_length, last_hashable + 1)
+                for covered in range(position, end):
+                    insert(covered)
+                position += best_length
+            else:
+                tokens.append(data[position])
+                if position <= last_hashable:
+                    insert(position)
+                position += 1
+
+        return tokens
+
+    def detokenize(self, tokens) -> bytes:
+        """
+        Rebuilds the data from literals and back references.
+        """
+        out = bytearray()
+        for token in tokens:
+            if isinstance(token, int):
+                out.append(token)
+                continue
+            length, distance = token
+            if not 0 < distance <= len(out):
+                raise ValueError(f"Back reference {token} points before the start.")
+            start = len(out) - distance
+            if distance >= length:
+                out += out[start : start + length]
+            else:
+                # Overlapping copy repeats the last distance bytes
+                pattern = out[start:]
+                out += (pattern * (length // distance + 1))[:length]
+        return bytes(out)
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Serializes the tokens of data after LZ77_HEADER. Every group of up to 8 tokens
+        is preceded by a flag byte whose bits, MSB first, mark back references. A literal
+        takes one byte, a back reference three: length - MIN_MATCH, then distance - 1
+        as an unsigned 16-bit big-endian integer.
+        """
+        data = bytes(data)
+        out = bytearray(LZ77_HEADER.pack(len(data)))
+        tokens = self.tokenize(data)
+        for group_start in range(0, len(tokens), 8):
+            flag_index = len(out)
+            out.append(0)
+            flags = 0
+            for bit, token in enumerate(tokens[group_start : group_start + 8]):
+                if isinstance(token, int):
+                    out.append(token)
+                else:
+                    length, distance = token
+                    flags |= 0x80 >> bit
+                    out.append(length - MIN_MATCH)
+                    out += (distance - 1).to_bytes(2, "big")
+            out[flag_index] = flags
+        return bytes(out)
+
+    def decompress(self, data: bytes) -> bytes:
+        """
+        Converts data produced by compress back into the original bytes.
+        """
+        if len(data) < LZ77_HEADER.size:
+            raise ValueError("Compressed input is shorter than its header.")
+        (size,) = LZ77_HEADER.unpack_from(data)
+
+        tokens = []
+        position = LZ77_HEADER.size
+        produced = 0
+        try:
+            while produced < size:
+                flags = data[position]
+                position += 1
+                for bit in range(8):
+                    if produced >= size:
+                        break
+                    if flags & (0x80 >> bit):
+                        if position + 3 > len(data):
+                            raise IndexError
+                        length = data[position] + MIN_MATCH
+                        distance = (
+                            int.from_bytes(data[position + 1 : position + 3], "big") + 1
+                        )
+                        tokens.append((length, distance))
+                        position += 3
+                        produced += length
+                    else:
+                        tokens.append(data[position])
+                        position += 1
+                        produced += 1
+        except IndexError:
+            raise ValueError("Compressed input is truncated.") from None
+
+        out = self.detokenize(tokens)
+        if len(out) != size:
+            raise ValueError("Compressed input doesn't match its declared size.")
+        return out
+
+
+def _match_length(data: bytes, candidate: int, position: int, limit: int) -> int:
+    """
+    Length of the common prefix of data[candidate:] and data[position:], at most
+    limit. Slices are compared in C, narrowing down the length by bisection.
+    """
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) >> 1
+        if (
+            data[candidate + low : candidate + middle]
+            == data[position + low : position + middle]
+        ):
+            low = middle
+        else:
+            high = middle - 1
+    return low
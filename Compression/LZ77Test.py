@@ -0,0 +1,108 @@
+from LZ77 import LZ77, MIN_MATCH
+import random
+import time
+
+
+def build_lz77(**kwargs):
+    return LZ77(**kwargs)
+
+
+def test_lz77_basic_round_trip():
+    lz = build_lz77()
+    data = b"abcabcabcabcabcabc hello hello hello"
+    compressed = lz.compress(data)
+    assert lz.decompress(compressed) == data
+    assert len(compressed) < len(data)
+
+
+def test_lz77_tokens():
+    """
+    A repeated prefix turns into a single overlapping back reference.
+    """
+    lz = build_lz77()
+    tokens = lz.tokenize(b"abcabcabcabc")
+    assert tokens == [ord("a"), ord("b"), ord("c"), (9, 3)]
+    assert lz.detokenize(tokens) == b"abcabcabcabc"
+
+
+def test_lz77_edge_cases():
+    lz = build_lz77()
+    for data in [b"", b"a", b"ab", b"aaa", b"\x00" * 1000]:
+        assert lz.decompress(lz.compress(data)) == data
+
+    try:
+        lz.decompress(lz.compress(b"abcabcabc")[:-2])
+        assert False, "Truncated input should be rejected"
+    except ValueError:
+        pass
+
+
+def test_lz77_respects_window_and_lookahead():
+    rng = random.Random(1)
+    block = bytes(rng.getrandbits(8) for _ in range(100))
+    data = block + bytes(rng.getrandbits(8) for _ in range(300)) + block * 3
+
+    lz = build_lz77(window_size=128, lookahead=20)
+    tokens = lz.tokenize(data)
+    for token in tokens:
+        if not isinstance(token, int):
+            length, distance = token
+            assert MIN_MATCH <= length <= 20
+            assert 0 < distance <= 128
+    assert lz.detokenize(tokens) == data
+    # The first repetition is out of reach of the small window
+    assert isinstance(tokens[400], int)
+
+
+def test_lz77_chain_depth_trades_speed_for_ratio():
+    rng = random.Random(2)
+    words = [bytes(rng.choices(b"abcdef", k=rng.randint(3, 8))) for _ in range(200)]
+    data = b" ".join(rng.choice(words) for _ in range(3000))
+
+    sizes = []
+    for max_chain in [1, 8, 128]:
+        lz = build_lz77(max_chain=max_chain)
+        compressed = lz.compress(data)
+        assert lz.decompress(compressed) == data
+        sizes.append(len(compressed))
+    assert sizes[0] >= sizes[1] >= sizes[2]
+
+
+def test_lz77_randomized(n=100):
+    for _ in range(n):
+        alphabet = bytes(random.sample(range(256), random.randint(1, 6)))
+        data = bytes(random.choice(alphabet) for _ in range(random.randint(0, 2000)))
+        lz = build_lz77(
+            window_size=random.choice([16, 300, 32768]),
+            lookahead=random.choice([MIN_MATCH, 10, 258]),
+            max_chain=random.choice([1, 4, 64]),
+        )
+        assert lz.decompress(lz.compress(data)) == data, f"Mismatch on {data!r}"
+
+
+def test_lz77_long_input_is_fast():
+    """
+    Highly repetitive input would be quadratic with a naive window scan.
+    """
+    data = b"0123456789" * 20000 + bytes(range(256)) * 100
+    lz = build_lz77()
+    start = time.perf_counter()
+    compressed = lz.compress(data)
+    assert time.perf_counter() - start < 5
+    assert len(compressed) < len(data) // 20
+    assert lz.decompress(compressed) == data
+
+
+def main():
+    test_lz77_basic_round_trip()
+    test_lz77_tokens()
+    test_lz77_edge_cases()
+    test_lz77_respects_window_and_lookahead()
+    test_lz77_chain_depth_trades_speed_for_ratio()
+    test_lz77_randomized(100)
+    test_lz77_long_input_is_fast()
+    print("All LZ77 tests passed.")
+
+
+if __name__ == "__main__":
+    main()
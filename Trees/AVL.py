@@ -4,50 +4,110 @@ from BinaryTree import BinaryTree, BinaryNode
 class AVL(BinaryTree):
     def __init__(self):
         super().__init__()
+        # Work done by the last insert or remove: rotations performed and nodes
+        # whose height and balance were checked
+        self.rotations = 0
+        self.visited = 0
 
-    def insert(self, value):
-        new_node = super().insert(value)
-        if new_node is not None:
-            self._balance(new_node)
-
-    def remove(self, value):
-        removed_node_parent = super().remove(value)
-        if removed_node_parent is not None:
-            self._balance(removed_node_parent)
-
-    def _balance(self, node: BinaryNode) -> None:
-        node.update_height()
-        node_parent = node.get_parent()
-        if node.balancing_factor() in [-2, 2]:
-            self._find_rotation_seq(node)
-        if node_parent is not None:
-            self._balance(node_parent)
-
-    def _find_rotation_seq(self, node: BinaryNode):
+    # Insert and remove walk the changed path through _update_path, which
+    # rebalances on the way up
+    def _update_path(self, node: BinaryNode | None) -> None:
+        """
+        Rebalances bottom-up from node. Once a subtree keeps its height, the heights
+        and balance factors above it can't change, so from there on only the sizes
+        are refreshed. An insert stops after at most one (single or double) rotation.
+        """
+        self.rotations = 0
+        self.visited = 0
+        while node is not None:
+            self.visited += 1
+            height = node.height
+            node.update_height()
+            node.update_size()
+            if node.balancing_factor() in [-2, 2]:
+                node = self._restore_balance(node)
+            if node.height == height:
+                break
+            node = node.get_parent()
+
+        if node is not None:
+            ancestor = node.get_parent()
+            while ancestor is not None:
+                ancestor.update_size()
+                ancestor = ancestor.get_parent()
+
+    def _restore_balance(self, node: BinaryNode) -> BinaryNode:
+        """
+        Rotates an unbalanced node, returns the new root of its subtree.
+        """
         if node.balancing_factor() == 2:
             node_rc = node.get_right_child()
-            if node_rc is not None:
-                if node_rc.balancing_factor() in [0, 1]:
-                    node.rotate_left(self)
-                    self._update_heights([node, node_rc])
-                elif node_rc.balancing_factor() == -1:
-                    node_rc.rotate_right(self)
-                    node.rotate_left(self)
-                    self._update_heights([node_rc, node, node.get_parent()])
+            assert node_rc is not None
+            if node_rc.balancing_factor() == -1:
+                node_rc.rotate_right(self)
+                self.rotations += 1
+            node.rotate_left(self)
         else:
             assert node.balancing_factor() == -2
             node_lc = node.get_left_child()
-            if node_lc is not None:
-                if node_lc.balancing_factor() in [0, -1]:
-                    node.rotate_right(self)
-                    self._update_heights([node, node_lc])
-                elif node_lc.balancing_factor() == 1:
-                    node_lc.rotate_left(self)
-                    node.rotate_right(self)
-                    self._update_heights([node, node_lc, node.get_parent()])
-
-        return 0
-
-    def _update_heights(self, node_list: list) -> None:
-        for node in node_list:
-            node.update_height()
+            assert node_lc is not None
+            if node_lc.balancing_factor() == 1:
+                node_lc.rotate_left(self)
+                self.rotations += 1
+            node.rotate_right(self)
+        self.rotations += 1
+
+        root = node.get_parent()
+        assert root is not None
+        return root
+
+    # -------------------------------------------------------
+    # JOIN
+    # -------------------------------------------------------
+
+    def _join(self, left, node: BinaryNode, right):
+        """
+        Joins two AVL subtrees below node. When their heights differ by more than
+        one, node is linked into the taller subtree's spine at the height of the
+        shorter one and the spine is rebalanced on the way back up, in
+        O(|h(left) - h(right)| + 1).
+        """
+        if _height(left) > _height(right) + 1:
+            return self._join_right(left, node, right)
+        if _height(right) > _height(left) + 1:
+            return self._join_left(left, node, right)
+        return node.relink(left, right)
+
+    def _join_right(self, left: BinaryNode, node: BinaryNode, right):
+        inner = left.right
+        if _height(inner) <= _height(right) + 1:
+            subtree = node.relink(inner, right)
+            if subtree.height <= _height(left.left) + 1:
+                return left.relink(left.left, subtree)
+            return left.relink(
+                left.left, subtree.rotate_detached_right()
+            ).rotate_detached_left()
+        subtree = self._join_right(inner, node, right)
+        root = left.relink(left.left, subtree)
+        if subtree.height <= _height(left.left) + 1:
+            return root
+        return root.rotate_detached_left()
+
+    def _join_left(self, left, node: BinaryNode, right: BinaryNode):
+        inner = right.left
+        if _height(inner) <= _height(left) + 1:
+            subtree = node.relink(left, inner)
+            if subtree.height <= _height(right.right) + 1:
+                return right.relink(subtree, right.right)
+            return right.relink(
+                subtree.rotate_detached_left(), right.right
+            ).rotate_detached_right()
+        subtree = self._join_left(left, node, inner)
+        root = right.relink(subtree, right.right)
+        if subtree.height <= _height(right.right) + 1:
+            return root
+        return root.rotate_detached_right()
+
+
+def _height(node: BinaryNode | None) -> int:
+    return node.height if node is not None else 0
@@ -1,5 +1,6 @@
 from BinaryTree import BinaryTree, BinaryNode
 from AVL import AVL
+import random
 
 
 def build_avl_tree():
@@ -166,6 +167,178 @@ def test_avl_correctly_remove_textbook():
     assert lc.get_value() == 18
 
 
+def recomputed_height(node) -> int:
+    if node is None:
+        return 0
+    left = recomputed_height(node.get_left_child())
+    right = recomputed_height(node.get_right_child())
+    assert node.get_height() == 1 + max(left, right), f"Stale height at {node}"
+    assert abs(right - left) <= 1, f"Unbalanced node {node}"
+    return 1 + max(left, right)
+
+
+def test_avl_cached_heights_random_operations():
+    rng = random.Random(5)
+    tree = build_avl_tree()
+    values = set()
+    for _ in range(2000):
+        value = rng.randint(0, 500)
+        if value in values and rng.random() < 0.5:
+            tree.remove(value)
+            values.discard(value)
+        elif value not in values:
+            tree.insert(value)
+            values.add(value)
+    recomputed_height(tree.get_root())
+    ordered = sorted(values)
+    assert [node.get_value() for node in tree.inorder_nodes()] == ordered
+
+    # Sizes survive the rotations
+    assert len(tree) == len(ordered)
+    for k in range(0, len(ordered), 7):
+        assert tree.select(k).get_value() == ordered[k]
+        assert tree.rank(ordered[k]) == k
+    assert tree.count_range(100, 200) == sum(100 <= v <= 200 for v in ordered)
+
+
+def test_avl_from_sorted_and_bulk_insert():
+    tree = AVL.from_sorted(range(0, 2000, 2))
+    assert isinstance(tree, AVL)
+    recomputed_height(tree.get_root())
+    assert len(tree) == 1000
+
+    # Small batch goes through regular inserts, large one relinks the tree
+    node = tree.binary_search(10)
+    assert tree.bulk_insert([11, 13, 10, 11]) == 2
+    assert tree.bulk_insert(range(1, 2000, 2)) == 998
+    assert tree.binary_search(10) is node
+    recomputed_height(tree.get_root())
+    assert [n.get_value() for n in tree.inorder_nodes()] == list(range(2000))
+
+    tree.insert(5000)
+    tree.remove(0)
+    recomputed_height(tree.get_root())
+
+    try:
+        AVL.from_sorted([1, 3, 2])
+        assert False, "Unsorted values should be rejected"
+    except ValueError:
+        pass
+
+
+def test_avl_rebalance_stops_early():
+    tree = build_avl_tree()
+    for value in range(1, 4):
+        tree.insert(value)
+    assert tree.rotations == 1
+
+    tree = AVL.from_sorted(range(0, 4000, 2))
+    depth = tree.get_root().get_height()
+    rng = random.Random(8)
+    total_visited = 0
+    for value in rng.sample(range(1, 4000, 2), 500):
+        tree.insert(value)
+        assert tree.rotations <= 2
+        assert tree.visited <= depth + 1
+        total_visited += tree.visited
+    recomputed_height(tree.get_root())
+    # Most inserts stop well below the root
+    assert total_visited < 500 * depth / 2
+
+    for value in rng.sample(range(0, 4000, 2), 500):
+        tree.remove(value)
+    recomputed_height(tree.get_root())
+    assert len(tree) == 2000
+    assert [tree.select(k).get_value() for k in range(0, 2000, 100)] == [
+        n.get_value() for n in tree.inorder_nodes()
+    ][::100]
+
+
+def test_avl_join_split_and_set_operations():
+    rng = random.Random(9)
+
+    def random_tree(values):
+        tree = build_avl_tree()
+        for value in rng.sample(sorted(values), len(values)):
+            tree.insert(value)
+        return tree
+
+    def check(tree, values):
+        recomputed_height(tree.get_root())
+        assert [n.get_value() for n in tree.inorder_nodes()] == sorted(values)
+        assert len(tree) == len(values)
+
+    for _ in range(50):
+        a = set(rng.sample(range(400), rng.randint(0, 150)))
+        b = set(rng.sample(range(400), rng.randint(0, 150)))
+        check(random_tree(a).union(random_tree(b)), a | b)
+        check(random_tree(a).intersection(random_tree(b)), a & b)
+        check(random_tree(a).difference(random_tree(b)), a - b)
+
+        key = rng.randrange(400)
+        tree = random_tree(a)
+        left, found, right = tree.split(key, consume=True)
+        assert found == (key in a)
+        assert tree.get_root() is None
+        check(left, {v for v in a if v < key})
+        check(right, {v for v in a if v > key})
+
+    # Heights far apart, the small tree is joined into the spine of the big one
+    small, big = AVL.from_sorted(range(3)), AVL.from_sorted(range(4, 2000))
+    joined = AVL.join(small, 3, big, consume=True)
+    check(joined, range(2000))
+    assert small.get_root() is None and big.get_root() is None
+    joined.insert(-1)
+    joined.remove(1000)
+    recomputed_height(joined.get_root())
+
+    # With consume=False the operands are copied and stay as they were
+    first, second = random_tree(range(0, 300, 2)), random_tree(range(0, 300, 3))
+    shape = [(n.get_value(), n.get_height()) for n in first.preorder_nodes()]
+    union = first.union(second, consume=False)
+    check(union, set(range(0, 300, 2)) | set(range(0, 300, 3)))
+    difference = first.difference(second, consume=False)
+    check(difference, set(range(0, 300, 2)) - set(range(0, 300, 3)))
+    assert [(n.get_value(), n.get_height()) for n in first.preorder_nodes()] == shape
+    check(second, range(0, 300, 3))
+    first.split(100, consume=False)
+    joined = AVL.join(first, 1000, AVL(), consume=False)
+    check(joined, set(range(0, 300, 2)) | {1000})
+    check(first, range(0, 300, 2))
+
+    # By default the operands are consumed
+    check(first.union(second), set(range(0, 300, 2)) | set(range(0, 300, 3)))
+    assert first.get_root() is None and second.get_root() is None
+
+    try:
+        AVL.join(AVL.from_sorted([1, 5]), 3, AVL())
+        assert False, "Values out of order should be rejected"
+    except ValueError:
+        pass
+    try:
+        AVL().union(BinaryTree([1]))
+        assert False, "Trees of different types shouldn't be combined"
+    except TypeError:
+        pass
+
+
+def test_avl_parallel_set_operations():
+    rng = random.Random(11)
+    first = set(rng.sample(range(6000), 2500))
+    second = set(rng.sample(range(6000), 2000))
+    for max_workers in [1, 2]:
+        union = AVL.from_sorted(sorted(first)).parallel_union(
+            AVL.from_sorted(sorted(second)), max_workers, threshold=200
+        )
+        common = AVL.from_sorted(sorted(first)).parallel_intersection(
+            AVL.from_sorted(sorted(second)), max_workers, threshold=200
+        )
+        for tree, values in [(union, first | second), (common, first & second)]:
+            recomputed_height(tree.get_root())
+            assert [n.get_value() for n in tree.inorder_nodes()] == sorted(values)
+            assert len(tree) == len(values)
+
+
 def main():
     test_avl_single_right_rotation_ll_case()
     test_avl_single_left_rotation_rr_case()
@@ -174,6 +347,11 @@ def main():
     test_avl_no_rebalance_needed()
     test_avl_correctly_insert_textbook()
     test_avl_correctly_remove_textbook()
+    test_avl_cached_heights_random_operations()
+    test_avl_from_sorted_and_bulk_insert()
+    test_avl_rebalance_stops_early()
+    test_avl_join_split_and_set_operations()
+    test_avl_parallel_set_operations()
     print("All AVL tests passed.")
     return 0
 
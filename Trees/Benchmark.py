@@ -0,0 +1,144 @@
+from AVL import AVL
+from BinaryTree import RED, BinaryNode
+from RBTree import RBTree
+import random
+import time
+import tracemalloc
+
+
+def timed(function, *args, repeat: int = 3):
+    """
+    Returns the result of the call and the best wall time out of repeat runs.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def allocated_bytes(function, *args) -> int:
+    """
+    Returns the number of bytes still allocated by the call's result.
+    """
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        size = tracemalloc.get_traced_memory()[0]
+        del result
+        return size
+    finally:
+        tracemalloc.stop()
+
+
+class StringColorNode:
+    """
+    Node layout before the compact colors: a per-instance __dict__ and the
+    color stored as the string "red" or "black".
+    """
+
+    height = -1
+    parent = None
+
+    def __init__(self, value):
+        self.value = value
+        self.left = None
+        self.right = None
+        self.color = "red"
+
+
+def benchmark_node_memory(count: int = 100_000):
+    """
+    Compares the memory per node of the compact node against the string version.
+    """
+    compact = allocated_bytes(lambda: [BinaryNode(None) for _ in range(count)])
+    string = allocated_bytes(lambda: [StringColorNode(None) for _ in range(count)])
+    print(f"Memory per node ({count} nodes)")
+    print(f"  string colors, __dict__: {string / count:.1f} B")
+    print(f"  integer colors, slots:   {compact / count:.1f} B")
+
+
+def benchmark_color_checks(count: int = 1_000_000):
+    """
+    Compares the color comparison of the rebalancing loops on both layouts.
+    """
+    compact = [BinaryNode(i) for i in range(1000)]
+    string = [StringColorNode(i) for i in range(1000)]
+    for node in compact:
+        node.color = RED
+    rounds = count // 1000
+
+    def count_compact():
+        return sum(node.color == RED for _ in range(rounds) for node in compact)
+
+    def count_string():
+        return sum(node.color == "red" for _ in range(rounds) for node in string)
+
+    _, compact_time = timed(count_compact)
+    _, string_time = timed(count_string)
+    print(f"Color checks ({count})")
+    print(f"  string colors:  {string_time:.3f}s")
+    print(f"  integer colors: {compact_time:.3f}s")
+
+
+def benchmark_rbtree(count: int = 100_000, seed: int = 0):
+    """
+    Times random inserts followed by removing every value.
+    """
+    values = random.Random(seed).sample(range(count * 10), count)
+
+    def churn():
+        tree = RBTree()
+        for value in values:
+            tree.insert(value)
+        for value in values:
+            tree.remove(value)
+
+    _, seconds = timed(churn, repeat=1)
+    print(f"RBTree: {count} inserts and removes in {seconds:.3f}s")
+
+
+def benchmark_set_operations(count: int = 1_000_000, max_workers: int | None = None):
+    """
+    Compares union and parallel_union of two interleaved trees of count values,
+    against inserting the values of one tree into the other.
+    """
+    for tree_class in (AVL, RBTree):
+
+        def trees():
+            return (
+                tree_class.from_sorted(range(0, 2 * count, 2)),
+                tree_class.from_sorted(range(1, 2 * count, 2)),
+            )
+
+        def inserts(first, second):
+            for node in second.inorder_nodes():
+                first.insert(node.value)
+
+        def union(first, second):
+            first.union(second)
+
+        def parallel_union(first, second):
+            first.parallel_union(second, max_workers)
+
+        print(f"{tree_class.__name__}: union of two trees of {count} values")
+        for name, operation in [
+            ("inserts", inserts),
+            ("union", union),
+            ("parallel_union", parallel_union),
+        ]:
+            _, seconds = timed(operation, *trees(), repeat=1)
+            print(f"  {name + ':':<16}{seconds:.3f}s")
+
+
+def main():
+    benchmark_node_memory()
+    benchmark_color_checks()
+    benchmark_rbtree()
+    benchmark_set_operations()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,23 @@
 from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+import os
+
+# Node colors of red-black trees, stored as small integers. get_color and
+# set_color translate them from and to the names "red" and "black".
+RED = 0
+BLACK = 1
+COLOR_NAMES = ("red", "black")
+
+# Combined size of two trees below which the parallel set operations, and their
+# subproblems, are run in this process
+PARALLEL_THRESHOLD = 1 << 16
 
 
 class BinaryNode:
-    height = -1
-    parent = None
+    # Fixed attribute layout instead of a per-node __dict__, trees hold many nodes.
+    # color is only used by red-black trees.
+    __slots__ = ("value", "left", "right", "parent", "height", "size", "color")
 
     def __init__(
         self, value, left: BinaryNode | None = None, right: BinaryNode | None = None
@@ -11,6 +25,10 @@ class BinaryNode:
         self.value = value
         self.left = left
         self.right = right
+        self.parent = None
+        self.color = None
+        self.update_height()
+        self.update_size()
 
     def __repr__(self):
         return f"BinaryNode({self.value})"
@@ -18,15 +36,23 @@ class BinaryNode:
     def __str__(self):
         return str(self.value)
 
+    # Heights and subtree sizes are cached: a leaf has height 1 and size 1, the
+    # update methods recompute them from the children's cached values. Whoever
+    # relinks nodes refreshes them bottom-up along the changed path.
     def update_height(self) -> None:
-        left_height = self.left.get_height() if self.left else 0
-        right_height = self.right.get_height() if self.right else 0
+        left_height = self.left.height if self.left else 0
+        right_height = self.right.height if self.right else 0
 
         self.height = 1 + max(left_height, right_height)
 
+    def update_size(self) -> None:
+        left_size = self.left.size if self.left else 0
+        right_size = self.right.size if self.right else 0
+
+        self.size = 1 + left_size + right_size
+
     # Getters and setters
     def get_height(self) -> int:
-        self.update_height()
         return self.height
 
     def get_value(self):
@@ -63,17 +89,31 @@ class BinaryNode:
     def make_root(self) -> None:
         self.parent = None
 
-    def get_color(self) -> str:
-        return self.color
+    def relink(self, left: BinaryNode | None, right: BinaryNode | None) -> BinaryNode:
+        """
+        Makes the node the root of a detached subtree with the given children and
+        refreshes its height and size. Returns the node.
+        """
+        self.set_left_child(left)
+        self.set_right_child(right)
+        self.make_root()
+        self.update_height()
+        self.update_size()
+        return self
 
-    def set_color(self, color: str) -> None:
-        self.color = color
+    def get_color(self) -> str | None:
+        return COLOR_NAMES[self.color] if self.color is not None else None
 
-    def swap_color(self) -> None:
-        if self.color == "red":
-            self.color = "black"
+    def set_color(self, color: str | int) -> None:
+        if color in (RED, BLACK):
+            self.color = color
+        elif color in COLOR_NAMES:
+            self.color = COLOR_NAMES.index(color)
         else:
-            self.color = "red"
+            raise ValueError(f"Unknown color {color!r}.")
+
+    def swap_color(self) -> None:
+        self.color = BLACK if self.color == RED else RED
 
     def find_rightmost(self) -> BinaryNode | None:
         node = self.get_right_child()
@@ -93,13 +133,16 @@ class BinaryNode:
                 return node
 
     # Essence of binary trees
+    # Returns the node holding value, or the last node on its search path
     def query(self, value):
-        if value < self.value and self.left:
-            return self.left.query(value)
-        elif value > self.value and self.right:
-            return self.right.query(value)
-        else:
-            return self
+        node = self
+        while True:
+            if value < node.value and node.left:
+                node = node.left
+            elif value > node.value and node.right:
+                node = node.right
+            else:
+                return node
 
     def get_child_count(self) -> int:
         left_child_count = 1 if self.left else 0
@@ -107,23 +150,20 @@ class BinaryNode:
         return left_child_count + right_child_count
 
     def get_subtree_nodes_count(self) -> int:
-        left_subtree_node_count = (
-            self.left.get_subtree_nodes_count() if self.left else 0
-        )
-        right_subtree_node_count = (
-            self.right.get_subtree_nodes_count() if self.right else 0
-        )
-        return 1 + left_subtree_node_count + right_subtree_node_count
+        return self.size
 
     # Balancing factor is defined as BF(S) = h(R) - h(L)
     def balancing_factor(self) -> int:
         left_height, right_height = 0, 0
         if self.left is not None:
-            left_height = self.left.get_height()
+            left_height = self.left.height
         if self.right is not None:
-            right_height = self.right.get_height()
+            right_height = self.right.height
         return right_height - left_height
 
+    # Rotations refresh the heights of the two rotated nodes, the heights of
+    # their ancestors are left to the caller. Sizes above don't change.
+
     def rotate_right(self, tree: BinaryTree) -> None:
         left_node = self.get_left_child()
         if left_node is None:
@@ -141,6 +181,10 @@ class BinaryNode:
         temp = left_node.get_right_child()
         left_node.set_right_child(self)
         self.set_left_child(temp)
+        self.update_height()
+        self.update_size()
+        left_node.update_height()
+        left_node.update_size()
 
     def rotate_left(self, tree: BinaryTree) -> None:
         right_node = self.get_right_child()
@@ -158,6 +202,27 @@ class BinaryNode:
         temp = right_node.get_left_child()
         right_node.set_left_child(self)
         self.set_right_child(temp)
+        self.update_height()
+        self.update_size()
+        right_node.update_height()
+        right_node.update_size()
+
+    # Rotations of detached subtrees (no parent and no tree), used while joining.
+    # Both return the new root of the subtree.
+
+    def rotate_detached_right(self) -> BinaryNode:
+        left_node = self.left
+        assert left_node is not None
+        return left_node.relink(
+            left_node.left, self.relink(left_node.right, self.right)
+        )
+
+    def rotate_detached_left(self) -> BinaryNode:
+        right_node = self.right
+        assert right_node is not None
+        return right_node.relink(
+            self.relink(self.left, right_node.left), right_node.right
+        )
 
 
 # This class does not provide support for duplicate value storage
@@ -167,21 +232,78 @@ class BinaryTree:
     def __init__(self, values: list | None = None):
         if values is None:
             return None
-        sorted_values = sorted(values)
-
-        # Creates balanced binary tree from sorted list
-        def _create_balanced_tree(values: list) -> BinaryNode | None:
-            n = len(values)
-            if n > 0:
-                i = (n // 2) + (n % 2)
-                root = BinaryNode(values[i - 1])
-                root.set_left_child(_create_balanced_tree(values[0 : i - 1]))
-                root.set_right_child(_create_balanced_tree(values[i:n]))
-                return root
-            else:
+        self._link_balanced([BinaryNode(value) for value in sorted(values)])
+
+    @classmethod
+    def from_sorted(cls, values):
+        """
+        Builds a balanced tree from strictly increasing values in O(n).
+        """
+        values = list(values)
+        for i in range(1, len(values)):
+            if not values[i - 1] < values[i]:
+                raise ValueError("Values have to be strictly increasing.")
+        tree = cls()
+        tree._link_balanced([BinaryNode(value) for value in values])
+        return tree
+
+    def bulk_insert(self, values) -> int:
+        """
+        Inserts a batch of values, skipping the ones already stored, and returns
+        the number of inserted values. A batch that's large compared to the tree
+        is merged with its in-order nodes and the tree is relinked balanced in
+        O(n + m), keeping the existing node objects. A small batch is inserted
+        one value at a time.
+        """
+        batch = sorted(values)
+        batch = [v for i, v in enumerate(batch) if i == 0 or batch[i - 1] < v]
+        if not batch:
+            return 0
+
+        size = len(self)
+        if len(batch) * (size + len(batch)).bit_length() < size + len(batch):
+            inserted = 0
+            for value in batch:
+                if self.binary_search(value) is None:
+                    self.insert(value)
+                    inserted += 1
+            return inserted
+
+        nodes = list(self.inorder_nodes())
+        merged = []
+        i = 0
+        for value in batch:
+            while i < len(nodes) and nodes[i].value < value:
+                merged.append(nodes[i])
+                i += 1
+            if i < len(nodes) and nodes[i].value == value:
+                continue
+            merged.append(BinaryNode(value))
+        merged.extend(nodes[i:])
+        self._link_balanced(merged)
+        return len(merged) - len(nodes)
+
+    def _link_balanced(self, nodes: list) -> None:
+        """
+        Relinks the nodes, given in order, into a balanced tree with the middle
+        node (the left one for an even count) of every range as its root.
+        """
+
+        def _link(low: int, high: int) -> BinaryNode | None:
+            if low >= high:
                 return None
-
-        self.root = _create_balanced_tree(sorted_values)
+            middle = (low + high - 1) // 2
+            root = nodes[middle]
+            root.left = root.right = None
+            root.set_left_child(_link(low, middle))
+            root.set_right_child(_link(middle + 1, high))
+            root.update_height()
+            root.update_size()
+            return root
+
+        self.root = _link(0, len(nodes))
+        if self.root is not None:
+            self.root.make_root()
 
     def __str__(self) -> str:
         """Return a pretty string representation of the tree (rotated 90°)."""
@@ -228,66 +350,115 @@ class BinaryTree:
             else:
                 print("Node with this value already exist in the tree.")
                 return None
+            self._update_path(node)
         return new_node
 
-    # Returns the parent node of the removed node
+    # Returns the parent of the node unlinked from the tree, for a node with two
+    # children that is the parent of its in-order predecessor
     def remove(self, value) -> BinaryNode | None:
         if self.root is None:
             print("Tree is empty, nothing to remove!")
             return None
 
         node = self.root.query(value)
-        if node is None:
+        if node.get_value() != value:
             print(f"Node with value: {value} doesn't exist in the tree")
             return None
 
+        if node.get_child_count() == 2:
+            # Deletion by copying, the predecessor has no right child so it's
+            # unlinked in its place
+            left_child = node.get_left_child()
+            assert left_child is not None
+            pred_node = left_child.find_rightmost()
+            assert pred_node is not None
+            node.set_value(pred_node.get_value())
+            node = pred_node
+
+        return self._unlink(node)
+
+    def _unlink(self, node: BinaryNode) -> BinaryNode | None:
+        """
+        Replaces a node with at most one child by that child, returns the parent.
+        """
         node_parent = node.get_parent()
+        child_node = node.get_left_child()
+        if child_node is None:
+            child_node = node.get_right_child()
+
+        if node_parent is None:
+            self.root = child_node
+            if child_node is not None:
+                child_node.make_root()
+        elif node_parent.get_left_child() is node:
+            node_parent.set_left_child(child_node)
+        else:
+            node_parent.set_right_child(child_node)
 
-        node_child_count = node.get_child_count()
-        if node_child_count == 0:
-            if node_parent is None:
-                self.root = None
-            elif node_parent.get_left_child() == node:
-                node_parent.set_left_child(None)
-            elif node_parent.get_right_child() == node:
-                node_parent.set_right_child(None)
-
-        elif node_child_count == 1:
-            child_node = (
-                node.get_right_child()
-                if node.get_right_child()
-                else node.get_left_child()
-            )
+        self._update_path(node_parent)
+        return node_parent
 
-            if node_parent is None:
-                if node.get_left_child():
-                    self.root = node.get_left_child()
-                elif node.get_right_child():
-                    self.root = node.get_right_child()
+    def _update_path(self, node: BinaryNode | None) -> None:
+        """
+        Refreshes the cached heights and sizes from node up to the root after a
+        child of node was linked or unlinked.
+        """
+        while node is not None:
+            node.update_height()
+            node.update_size()
+            node = node.parent
 
-            elif node_parent.get_left_child() == node:
-                node_parent.set_left_child(child_node)
-            elif node_parent.get_right_child() == node:
-                node_parent.set_right_child(child_node)
+    def update_cached_fields(self) -> None:
+        """
+        Recomputes every cached height and size, after restructuring the whole tree.
+        """
+        for node in self.postorder_nodes():
+            node.update_height()
+            node.update_size()
 
-        # Found node has to have 2 child nodes
-        else:
-            assert node_child_count == 2
-            # Deletion by copying
-            temp_node = node.get_left_child()
-            pred_node_value = None
-            if temp_node is not None:
-                pred_node = temp_node.find_rightmost()
-                if pred_node is not None:
-                    pred_node_value = pred_node.get_value()
-
-            # succ_node_value =
-            # node.get_right_child().find_leftmost().get_value())
-            assert pred_node_value is not None
-            self.remove(pred_node_value)
-            node.set_value(pred_node_value)
+    def __len__(self) -> int:
+        return self.root.size if self.root is not None else 0
 
-        return node_parent
+    # -------------------------------------------------------
+    # ORDER STATISTICS
+    # -------------------------------------------------------
+
+    def rank(self, value) -> int:
+        """Number of values in the tree smaller than value."""
+        return self._count_below(value, False)
+
+    def select(self, k: int) -> BinaryNode:
+        """Node holding the k-th smallest value, counting from 0."""
+        if not 0 <= k < len(self):
+            raise IndexError(f"Index {k} is out of range for {len(self)} values.")
+        node = self.root
+        while True:
+            left_size = node.left.size if node.left else 0
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    def count_range(self, low, high) -> int:
+        """Number of values v in the tree with low <= v <= high."""
+        if high < low:
+            return 0
+        return self._count_below(high, True) - self._count_below(low, False)
+
+    def _count_below(self, value, inclusive: bool) -> int:
+        """Number of values smaller than (or equal to, if inclusive) value."""
+        count = 0
+        node = self.root
+        while node is not None:
+            if node.value < value or (inclusive and node.value == value):
+                count += 1 + (node.left.size if node.left else 0)
+                node = node.right
+            else:
+                node = node.left
+        return count
 
     def make_right_backbone(self):
         node = self.root
@@ -298,46 +469,433 @@ class BinaryTree:
                 node = temp
             else:
                 node = node.get_right_child()
+        self.update_cached_fields()
 
     # -------------------------------------------------------
-    # TRAVERSAL HELPERS
+    # ORDERED ACCESS
     # -------------------------------------------------------
 
-    def inorder_nodes(self):
-        """Generator yielding nodes in in-order (Left → Root → Right)."""
+    def floor(self, value) -> BinaryNode | None:
+        """Node with the largest value <= value."""
+        return self._closest(value, below=True, inclusive=True)
 
-        def _inorder(node):
-            if node is None:
-                return
-            yield from _inorder(node.get_left_child())
-            yield node
-            yield from _inorder(node.get_right_child())
+    def ceiling(self, value) -> BinaryNode | None:
+        """Node with the smallest value >= value."""
+        return self._closest(value, below=False, inclusive=True)
 
-        if self.root is not None:
-            yield from _inorder(self.root)
+    def predecessor(self, value) -> BinaryNode | None:
+        """Node with the largest value < value, value doesn't have to be stored."""
+        return self._closest(value, below=True, inclusive=False)
 
-    def preorder_nodes(self):
-        """Generator yielding nodes in pre-order (Root → Left → Right)."""
+    def successor(self, value) -> BinaryNode | None:
+        """Node with the smallest value > value, value doesn't have to be stored."""
+        return self._closest(value, below=False, inclusive=False)
+
+    def _closest(self, value, below: bool, inclusive: bool) -> BinaryNode | None:
+        best = None
+        node = self.root
+        while node is not None:
+            if node.value == value and inclusive:
+                return node
+            if node.value < value or (node.value == value and not below):
+                if below:
+                    best = node
+                node = node.right
+            else:
+                if not below:
+                    best = node
+                node = node.left
+        return best
+
+    def iter_from(self, value):
+        """
+        Generator yielding the nodes with values >= value in order. Only the
+        search path is visited before the first node.
+        """
+        # Ancestors still to be visited, the nodes where the search went left
+        stack = []
+        node = self.root
+        while node is not None:
+            if node.value < value:
+                node = node.right
+            else:
+                stack.append(node)
+                node = node.left
 
-        def _preorder(node):
-            if node is None:
+        while stack:
+            node = stack.pop()
+            yield node
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def range(self, low, high):
+        """Generator yielding the nodes with low <= value <= high in order."""
+        for node in self.iter_from(low):
+            if node.value > high:
                 return
             yield node
-            yield from _preorder(node.get_left_child())
-            yield from _preorder(node.get_right_child())
 
+    # -------------------------------------------------------
+    # JOIN-BASED SET OPERATIONS
+    # -------------------------------------------------------
+    # Split, union, intersection and difference are built on _join, which only
+    # the balanced subclasses implement, and cost O(m log(n/m + 1)) for sizes m <= n.
+    # They work on detached subtrees passed around as handles: the root node
+    # (None when empty), RBTree pairs it with the black height. Nodes know their
+    # parent, so subtrees can't be shared with the result: by default the trees
+    # given are consumed, their nodes are relinked into the result and the trees
+    # are left empty. consume=False copies them first in O(n + m) instead.
+
+    @classmethod
+    def join(
+        cls, left: BinaryTree, value, right: BinaryTree, consume: bool = True
+    ) -> BinaryTree:
+        """
+        Joins left, value and right, where every value of left is smaller than
+        value and every value of right larger, into a new tree in O(log n).
+        left and right are consumed and left empty, with consume=False they're
+        copied in O(n) and stay unchanged.
+        """
+        cls._check_joinable(left)
+        cls._check_joinable(right)
+        if left.root is not None and not left.root.find_rightmost().value < value:
+            raise ValueError("Values of the left tree have to be smaller than value.")
+        if right.root is not None and not value < next(right.inorder_nodes()).value:
+            raise ValueError("Values of the right tree have to be larger than value.")
+        tree = cls()
+        tree._adopt(
+            tree._join(left._take(consume), BinaryNode(value), right._take(consume))
+        )
+        return tree
+
+    def split(self, value, consume: bool = True) -> tuple[BinaryTree, bool, BinaryTree]:
+        """
+        Splits the tree into the values smaller and larger than value in
+        O(log n), returns both trees and whether value was stored. This tree is
+        consumed and left empty, with consume=False it's copied in O(n) and
+        stays unchanged.
+        """
+        self._check_joinable(self)
+        left, found, right = self._split(self._take(consume), value)
+        return self._wrap(left), found is not None, self._wrap(right)
+
+    def union(self, other: BinaryTree, consume: bool = True) -> BinaryTree:
+        """
+        New tree with the values stored in either tree. Both trees are consumed
+        and left empty, with consume=False they're copied and stay unchanged.
+        """
+        self._check_joinable(other)
+        return self._wrap(self._union(self._take(consume), other._take(consume)))
+
+    def intersection(self, other: BinaryTree, consume: bool = True) -> BinaryTree:
+        """
+        New tree with the values stored in both trees. Both trees are consumed
+        and left empty, with consume=False they're copied and stay unchanged.
+        """
+        self._check_joinable(other)
+        return self._wrap(self._intersection(self._take(consume), other._take(consume)))
+
+    def difference(self, other: BinaryTree, consume: bool = True) -> BinaryTree:
+        """
+        New tree with the values of this tree that aren't stored in other. Both
+        trees are consumed and left empty, with consume=False they're copied and
+        stay unchanged.
+        """
+        self._check_joinable(other)
+        return self._wrap(self._difference(self._take(consume), other._take(consume)))
+
+    def copy(self) -> BinaryTree:
+        """
+        Copy of the tree with the same shape, cached fields and colors.
+        """
+        tree = type(self)()
+        copies = {}
+        for node in self.preorder_nodes():
+            clone = copies[node] = BinaryNode(node.value)
+            clone.height, clone.size, clone.color = node.height, node.size, node.color
+            parent = node.parent
+            if parent is None:
+                tree.root = clone
+            elif parent.left is node:
+                copies[parent].set_left_child(clone)
+            else:
+                copies[parent].set_right_child(clone)
+        return tree
+
+    def parallel_union(
+        self,
+        other: BinaryTree,
+        max_workers: int | None = None,
+        threshold: int = PARALLEL_THRESHOLD,
+        consume: bool = True,
+    ) -> BinaryTree:
+        """
+        union with the top levels of the recursion forked into a process pool.
+        A single worker, or trees smaller than threshold together, do the work
+        in this process. Both trees are consumed unless consume=False, as for
+        union.
+        """
+        return self._parallel("union", other, max_workers, threshold, consume)
+
+    def parallel_intersection(
+        self,
+        other: BinaryTree,
+        max_workers: int | None = None,
+        threshold: int = PARALLEL_THRESHOLD,
+        consume: bool = True,
+    ) -> BinaryTree:
+        """
+        intersection with the top levels of the recursion forked into a process
+        pool, like parallel_union.
+        """
+        return self._parallel("intersection", other, max_workers, threshold, consume)
+
+    def _parallel(
+        self, operation: str, other, max_workers, threshold, consume: bool
+    ) -> BinaryTree:
+        """
+        Runs the recursion of a set operation in this process down to a depth
+        giving a few subproblems per worker. The subproblems are sent to the
+        workers as sorted value lists, their results are rebuilt with
+        from_sorted and joined back along the recursion.
+        """
+        self._check_joinable(other)
+        workers = max_workers or os.cpu_count() or 1
+        if workers == 1 or len(self) + len(other) < threshold:
+            return getattr(self, operation)(other, consume)
+        combine = getattr(self, f"_{operation}")
+        depth = workers.bit_length()
+        tasks = []
+
+        # Plans of the forked recursion: ("task", index) for a subproblem run by
+        # a worker, ("done", handle) for one that was small enough to run here
+        # and ("split", left plan, node, found, right plan) for a recursion step
+        def fork(first, second, depth: int):
+            sizes = [self._handle_root(handle) for handle in (first, second)]
+            sizes = [root.size if root is not None else 0 for root in sizes]
+            if 0 in sizes or sum(sizes) < threshold:
+                return "done", combine(first, second)
+            if depth == 0:
+                tasks.append((self._values(first), self._values(second)))
+                return "task", len(tasks) - 1
+            left, node, right = self._expose(second)
+            smaller, found, larger = self._split(first, node.value)
+            return (
+                "split",
+                fork(smaller, left, depth - 1),
+                node,
+                found is not None,
+                fork(larger, right, depth - 1),
+            )
+
+        plan = fork(self._take(consume), other._take(consume), depth)
+        with _tree_executor(workers, len(tasks)) as pool:
+            run = pool.map if pool else map
+            results = list(
+                run(
+                    _combine_sorted,
+                    [type(self)] * len(tasks),
+                    [operation] * len(tasks),
+                    *zip(*tasks),
+                )
+            )
+
+        def build(plan):
+            if plan[0] == "task":
+                return type(self).from_sorted(results[plan[1]])._take(consume=True)
+            if plan[0] == "done":
+                return plan[1]
+            _, left, node, found, right = plan
+            left, right = build(left), build(right)
+            if operation == "intersection" and not found:
+                return self._join_two(left, right)
+            return self._join(left, node, right)
+
+        return self._wrap(build(plan))
+
+    def _values(self, handle) -> list:
+        """Values of a detached subtree in order, the subtree is consumed."""
+        return [node.value for node in self._wrap(handle).inorder_nodes()]
+
+    @classmethod
+    def _check_joinable(cls, tree) -> None:
+        if cls._join is BinaryTree._join:
+            raise TypeError(
+                f"{cls.__name__} isn't balanced, join, split and the set "
+                "operations need an AVL or RBTree."
+            )
+        if type(tree) is not cls:
+            raise TypeError(f"Expected {cls.__name__}, got {type(tree).__name__}.")
+
+    def _take(self, consume: bool):
+        """
+        Detaches the whole tree as a handle, leaving the tree empty, or a copy of
+        it when not consuming.
+        """
+        tree = self if consume else self.copy()
+        handle = tree._handle(tree.root)
+        tree.root = None
+        return handle
+
+    def _wrap(self, handle) -> BinaryTree:
+        tree = type(self)()
+        tree._adopt(handle)
+        return tree
+
+    def _adopt(self, handle) -> None:
+        self.root = self._handle_root(handle)
         if self.root is not None:
-            yield from _preorder(self.root)
+            self.root.make_root()
+
+    def _handle(self, root: BinaryNode | None):
+        return root
+
+    def _handle_root(self, handle) -> BinaryNode | None:
+        return handle
+
+    def _expose(self, handle):
+        """Splits a non-empty subtree into its left subtree, root and right subtree."""
+        root = handle
+        left, right = root.left, root.right
+        for child in (left, right):
+            if child is not None:
+                child.make_root()
+        return left, root, right
+
+    def _join(self, left, node: BinaryNode, right):
+        """
+        Links two subtrees below node, all values of left being smaller than
+        node's and all values of right larger, rebalancing the result. Only the
+        balanced subclasses implement it, the recursion of split and the set
+        operations is as deep as the tree.
+        """
+        raise NotImplementedError(f"{type(self).__name__} doesn't support joins.")
+
+    def _split(self, handle, value):
+        """
+        Splits a subtree into the values smaller and larger than value, returns
+        both and the node holding value (None if it's not stored).
+        """
+        if self._handle_root(handle) is None:
+            return handle, None, handle
+        left, node, right = self._expose(handle)
+        if value == node.value:
+            return left, node, right
+        if value < node.value:
+            smaller, found, larger = self._split(left, value)
+            return smaller, found, self._join(larger, node, right)
+        smaller, found, larger = self._split(right, value)
+        return self._join(left, node, smaller), found, larger
+
+    def _split_last(self, handle):
+        """Removes the largest node of a non-empty subtree, returns both."""
+        left, node, right = self._expose(handle)
+        if self._handle_root(right) is None:
+            return left, node
+        rest, last = self._split_last(right)
+        return self._join(left, node, rest), last
+
+    def _join_two(self, left, right):
+        """Like _join without a middle node, the largest node of left takes its place."""
+        if self._handle_root(left) is None:
+            return right
+        rest, last = self._split_last(left)
+        return self._join(rest, last, right)
+
+    def _union(self, first, second):
+        if self._handle_root(first) is None:
+            return second
+        if self._handle_root(second) is None:
+            return first
+        left, node, right = self._expose(second)
+        smaller, _, larger = self._split(first, node.value)
+        return self._join(self._union(smaller, left), node, self._union(larger, right))
+
+    def _intersection(self, first, second):
+        if self._handle_root(first) is None:
+            return first
+        if self._handle_root(second) is None:
+            return second
+        left, node, right = self._expose(second)
+        smaller, found, larger = self._split(first, node.value)
+        left = self._intersection(smaller, left)
+        right = self._intersection(larger, right)
+        if found is None:
+            return self._join_two(left, right)
+        return self._join(left, node, right)
+
+    def _difference(self, first, second):
+        if self._handle_root(first) is None or self._handle_root(second) is None:
+            return first
+        left, node, right = self._expose(second)
+        smaller, _, larger = self._split(first, node.value)
+        return self._join_two(
+            self._difference(smaller, left), self._difference(larger, right)
+        )
 
-    def postorder_nodes(self):
-        """Generator yielding nodes in post-order (Left → Right → Root)."""
+    # -------------------------------------------------------
+    # TRAVERSAL HELPERS
+    # -------------------------------------------------------
 
-        def _postorder(node):
-            if node is None:
-                return
-            yield from _postorder(node.get_left_child())
-            yield from _postorder(node.get_right_child())
+    def inorder_nodes(self):
+        """Generator yielding nodes in in-order (Left → Root → Right)."""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
             yield node
+            node = node.right
 
-        if self.root is not None:
-            yield from _postorder(self.root)
+    def preorder_nodes(self):
+        """Generator yielding nodes in pre-order (Root → Left → Right)."""
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+
+    def postorder_nodes(self):
+        """Generator yielding nodes in post-order (Left → Right → Root)."""
+        stack = []
+        node = self.root
+        last = None
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node.left
+                continue
+            top = stack[-1]
+            if top.right is not None and top.right is not last:
+                # Right subtree not visited yet
+                node = top.right
+            else:
+                yield top
+                last = stack.pop()
+
+
+def _tree_executor(max_workers: int, task_count: int):
+    """
+    Returns the process pool for the set operation workers, or a context holding
+    None when the work is done in this process.
+    """
+    if max_workers == 1 or task_count < 2:
+        return nullcontext()
+    return ProcessPoolExecutor(max_workers)
+
+
+def _combine_sorted(tree_class, operation: str, first: list, second: list) -> list:
+    """
+    Worker of the parallel set operations, combines two sorted value lists.
+    """
+    tree = getattr(tree_class.from_sorted(first), operation)(
+        tree_class.from_sorted(second), consume=True
+    )
+    return [node.value for node in tree.inorder_nodes()]
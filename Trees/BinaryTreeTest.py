@@ -159,6 +159,21 @@ def test_remove_from_empty_tree():
     tree.remove(10)
 
 
+def test_remove_missing_value_keeps_tree():
+    tree = sample_tree()
+    assert tree.remove(10) is None
+    assert [node.get_value() for node in tree.inorder_nodes()] == list(range(2, 9))
+
+
+def test_remove_root_with_one_child():
+    tree = BinaryTree()
+    tree.insert(5)
+    tree.insert(3)
+    tree.remove(5)
+    assert tree.root is not None and tree.root.get_value() == 3
+    assert tree.root.get_parent() is None
+
+
 def test_balanced_tree_constructor():
     values = [1, 2, 3, 4, 5, 6, 7]
     tree = BinaryTree(values)
@@ -305,6 +320,148 @@ def test_height_updates_correctly():
     assert tree.binary_search(7).get_height() >= old_height
 
 
+def test_node_has_no_instance_dict():
+    node = BinaryNode(1)
+    assert not hasattr(node, "__dict__")
+    assert node.get_parent() is None and node.get_color() is None
+    try:
+        node.extra = 1
+        assert False, "Nodes should only hold their declared fields"
+    except AttributeError:
+        pass
+
+
+def test_skewed_tree_beyond_recursion_limit():
+    """
+    Sorted inserts give a path deeper than Python's recursion limit.
+    """
+    n = 3000
+    tree = BinaryTree()
+    for value in range(n):
+        tree.insert(value)
+    assert tree.binary_search(n - 1) is not None
+
+    values = list(range(n))
+    assert [node.get_value() for node in tree.inorder_nodes()] == values
+    assert [node.get_value() for node in tree.preorder_nodes()] == values
+    assert [node.get_value() for node in tree.postorder_nodes()] == values[::-1]
+
+    for value in range(0, n, 2):
+        tree.remove(value)
+    assert [node.get_value() for node in tree.inorder_nodes()] == values[1::2]
+
+
+def test_traversal_orders():
+    tree = sample_tree()
+    assert [n.get_value() for n in tree.preorder_nodes()] == [5, 3, 2, 4, 7, 6, 8]
+    assert [n.get_value() for n in tree.postorder_nodes()] == [2, 4, 3, 6, 8, 7, 5]
+    assert list(BinaryTree().postorder_nodes()) == []
+
+
+def test_order_statistics():
+    tree = sample_tree()
+    values = list(range(2, 9))
+    assert len(tree) == 7 and len(BinaryTree()) == 0
+    for k, value in enumerate(values):
+        assert tree.select(k).get_value() == value
+        assert tree.rank(value) == k
+    assert tree.rank(1) == 0 and tree.rank(100) == 7
+    assert tree.rank(4.5) == 3
+
+    assert tree.count_range(3, 6) == 4
+    assert tree.count_range(3.5, 6.5) == 3
+    assert tree.count_range(0, 100) == 7
+    assert tree.count_range(6, 3) == 0
+
+    try:
+        tree.select(7)
+        assert False, "Index past the end should be rejected"
+    except IndexError:
+        pass
+
+
+def test_sizes_follow_updates():
+    tree = sample_tree()
+    tree.insert(9)
+    tree.remove(3)
+    tree.remove(5)
+    assert len(tree) == 6
+    for node in tree.inorder_nodes():
+        left = node.get_left_child()
+        right = node.get_right_child()
+        expected = 1 + (left.size if left else 0) + (right.size if right else 0)
+        assert node.get_subtree_nodes_count() == expected
+    assert [tree.select(k).get_value() for k in range(6)] == [2, 4, 6, 7, 8, 9]
+
+    tree.make_right_backbone()
+    assert len(tree) == 6 and tree.select(5).get_value() == 9
+
+
+def test_floor_ceiling_successor_predecessor():
+    tree = BinaryTree([10, 20, 30, 40, 50])
+
+    def value(node):
+        return node.get_value() if node is not None else None
+
+    assert value(tree.floor(35)) == 30 and value(tree.floor(30)) == 30
+    assert value(tree.ceiling(35)) == 40 and value(tree.ceiling(30)) == 30
+    assert value(tree.predecessor(30)) == 20 and value(tree.predecessor(35)) == 30
+    assert value(tree.successor(30)) == 40 and value(tree.successor(35)) == 40
+    assert tree.floor(5) is None and tree.ceiling(55) is None
+    assert tree.predecessor(10) is None and tree.successor(50) is None
+    assert BinaryTree().floor(1) is None
+
+
+def test_range_and_iter_from():
+    tree = BinaryTree(list(range(0, 100, 3)))
+    assert [n.get_value() for n in tree.range(10, 30)] == [12, 15, 18, 21, 24, 27, 30]
+    assert [n.get_value() for n in tree.range(40, 20)] == []
+    assert [n.get_value() for n in tree.iter_from(90)] == [90, 93, 96, 99]
+    assert [n.get_value() for n in tree.iter_from(100)] == []
+    assert len(list(tree.iter_from(-5))) == len(tree)
+
+    # Stops early without walking the rest of the tree
+    window = tree.iter_from(50)
+    assert [next(window).get_value() for _ in range(3)] == [51, 54, 57]
+
+
+def test_set_operations_need_a_balanced_tree():
+    # Joins without rebalancing would recurse as deep as a skewed tree, this
+    # one is deeper than the recursion limit of 1000
+    tree = BinaryTree()
+    for value in range(1200):
+        tree.insert(value)
+    for operation in [
+        lambda: tree.union(BinaryTree([5000])),
+        lambda: tree.intersection(BinaryTree([5000])),
+        lambda: tree.difference(BinaryTree([5000])),
+        lambda: tree.split(10),
+        lambda: BinaryTree.join(tree, 5000, BinaryTree()),
+        lambda: tree.parallel_union(BinaryTree([5000])),
+    ]:
+        try:
+            operation()
+            assert False, "Plain trees should be rejected"
+        except TypeError:
+            pass
+    assert len(tree) == 1200
+
+
+def test_copy():
+    tree = BinaryTree(list(range(20)))
+    copy = tree.copy()
+    for node, clone in zip(tree.preorder_nodes(), copy.preorder_nodes()):
+        assert node is not clone
+        assert node.get_value() == clone.get_value()
+        assert node.get_height() == clone.get_height()
+        assert node.get_subtree_nodes_count() == clone.get_subtree_nodes_count()
+    assert copy.get_root().get_parent() is None
+
+    copy.remove(10)
+    assert tree.binary_search(10) is not None
+    assert BinaryTree().copy().get_root() is None
+
+
 def main():
     test_insert_root()
     test_insert_multiple_nodes()
@@ -320,6 +477,8 @@ def main():
     test_remove_node_with_two_children()
     test_remove_root_with_two_children()
     test_remove_from_empty_tree()
+    test_remove_missing_value_keeps_tree()
+    test_remove_root_with_one_child()
     # New functionality tests
     test_balanced_tree_constructor()
     test_find_leftmost_and_rightmost()
@@ -335,6 +494,15 @@ def main():
     test_rotate_left_no_right_child_does_nothing()
     test_empty_tree_str()
     test_height_updates_correctly()
+    test_node_has_no_instance_dict()
+    test_skewed_tree_beyond_recursion_limit()
+    test_traversal_orders()
+    test_order_statistics()
+    test_sizes_follow_updates()
+    test_floor_ceiling_successor_predecessor()
+    test_range_and_iter_from()
+    test_set_operations_need_a_balanced_tree()
+    test_copy()
 
 
 if __name__ == "__main__":
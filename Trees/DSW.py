@@ -22,6 +22,7 @@ class DSW:
         while i > 1:
             i = i // 2
             self._DSW_rotate(i)
+        self.tree.update_cached_fields()
 
     def _DSW_rotate(self, node_count):
         node = self.tree.get_root()
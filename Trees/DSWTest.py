@@ -115,6 +115,9 @@ def test_DSW_reduces_tree_height():
     assert root_after is not None
     height_after = root_after.get_height()
     assert height_after < height_before
+    # Cached heights were refreshed after the rotations
+    assert height_after == 3
+    assert root_after.get_left_child().get_height() == 2
 
 
 def main():
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from BinaryTree import BinaryNode, BinaryTree
+from BinaryTree import BLACK, RED, BinaryNode, BinaryTree
 
 
 class RBTree(BinaryTree):
@@ -15,28 +15,251 @@ class RBTree(BinaryTree):
     def insert(self, value) -> None:
         new_node = super().insert(value)
         if new_node is not None:
-            new_node.set_color("red")
+            new_node.color = RED
             self._restructure(new_node)
+            # Rotations refreshed the rotated nodes, the heights above them
+            # are on the path from new_node to the root (sizes are already set)
+            node = new_node
+            while node is not None:
+                node.update_height()
+                node.update_size()
+                node = node.get_parent()
+
+    def _unlink(self, node: BinaryNode) -> BinaryNode | None:
+        """
+        Unlinks a node with at most one child. Removing a black node leaves its
+        place one black short, which is repaired by _remove_fixup.
+        """
+        child = node.get_left_child()
+        if child is None:
+            child = node.get_right_child()
+        parent = super()._unlink(node)
+
+        if node.color == BLACK:
+            if child is not None and child.color == RED:
+                child.color = BLACK
+            else:
+                self._remove_fixup(child, parent)
+                # Rotations refreshed the rotated nodes, the heights above them
+                # are on the path from parent to the root
+                ancestor = parent
+                while ancestor is not None:
+                    ancestor.update_height()
+                    ancestor.update_size()
+                    ancestor = ancestor.get_parent()
+        return parent
+
+    def _remove_fixup(self, node: BinaryNode | None, parent: BinaryNode | None):
+        """
+        Pushes the missing black of node (None standing for a leaf) up the tree
+        until it can be absorbed by a red node, a recoloring or rotations at parent.
+        """
+        while node is not self.root and self._is_black(node):
+            assert parent is not None
+            if node is parent.get_left_child():
+                sibling = parent.get_right_child()
+                assert sibling is not None
+                if sibling.color == RED:
+                    sibling.color = BLACK
+                    parent.color = RED
+                    parent.rotate_left(self)
+                    sibling = parent.get_right_child()
+                if self._is_black(sibling.get_left_child()) and self._is_black(
+                    sibling.get_right_child()
+                ):
+                    sibling.color = RED
+                    node = parent
+                    parent = node.get_parent()
+                    continue
+                if self._is_black(sibling.get_right_child()):
+                    sibling.get_left_child().color = BLACK
+                    sibling.color = RED
+                    sibling.rotate_right(self)
+                    sibling = parent.get_right_child()
+                sibling.color = parent.color
+                parent.color = BLACK
+                sibling.get_right_child().color = BLACK
+                parent.rotate_left(self)
+            else:
+                sibling = parent.get_left_child()
+                assert sibling is not None
+                if sibling.color == RED:
+                    sibling.color = BLACK
+                    parent.color = RED
+                    parent.rotate_right(self)
+                    sibling = parent.get_left_child()
+                if self._is_black(sibling.get_left_child()) and self._is_black(
+                    sibling.get_right_child()
+                ):
+                    sibling.color = RED
+                    node = parent
+                    parent = node.get_parent()
+                    continue
+                if self._is_black(sibling.get_left_child()):
+                    sibling.get_right_child().color = BLACK
+                    sibling.color = RED
+                    sibling.rotate_left(self)
+                    sibling = parent.get_left_child()
+                sibling.color = parent.color
+                parent.color = BLACK
+                sibling.get_left_child().color = BLACK
+                parent.rotate_right(self)
+            node = self.root
+        if node is not None:
+            node.color = BLACK
+
+    @staticmethod
+    def _is_black(node: BinaryNode | None) -> bool:
+        return node is None or node.color == BLACK
+
+    def validate(self) -> int:
+        """
+        Checks the search order and the red-black properties, raising ValueError
+        on the first violation. Returns the black height of the tree, leaves
+        included.
+        """
+        if self.root is not None and self.root.color != BLACK:
+            raise ValueError("Root has to be black.")
+
+        black_heights = {None: 1}
+        previous = None
+        for node in self.inorder_nodes():
+            if previous is not None and not previous.get_value() < node.get_value():
+                raise ValueError(f"Node {node} breaks the search order.")
+            previous = node
+
+        for node in self.postorder_nodes():
+            color = node.color
+            if color not in (RED, BLACK):
+                raise ValueError(f"Node {node} has invalid color {color!r}.")
+            left, right = node.get_left_child(), node.get_right_child()
+            if color == RED and not (self._is_black(left) and self._is_black(right)):
+                raise ValueError(f"Red node {node} has a red child.")
+            if black_heights[left] != black_heights[right]:
+                raise ValueError(f"Black heights differ below node {node}.")
+            black_heights[node] = black_heights[left] + (color == BLACK)
+        return black_heights[self.root]
+
+    def _link_balanced(self, nodes: list) -> None:
+        """
+        Balanced relinking, colored black except for the deepest level, which is
+        red. Every leaf of the balanced tree is on one of the two deepest levels,
+        so all paths see the same number of black nodes.
+        """
+        super()._link_balanced(nodes)
+        if self.root is None:
+            return
+        deepest = self.root.get_height() - 1
+        stack = [(self.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            node.color = RED if depth == deepest and depth > 0 else BLACK
+            for child in (node.get_left_child(), node.get_right_child()):
+                if child is not None:
+                    stack.append((child, depth + 1))
+
+    # -------------------------------------------------------
+    # JOIN
+    # -------------------------------------------------------
+    # Subtree handles are (root, black height) pairs, the black height counting
+    # the black nodes on a path from root down to a leaf (0 for an empty
+    # subtree). Joined subtrees may have a red root, _adopt blackens it.
+
+    def _handle(self, root: BinaryNode | None):
+        black_height = 0
+        node = root
+        while node is not None:
+            black_height += node.color == BLACK
+            node = node.get_left_child()
+        return root, black_height
+
+    def _handle_root(self, handle) -> BinaryNode | None:
+        return handle[0]
+
+    def _adopt(self, handle) -> None:
+        super()._adopt(handle)
+        if self.root is not None:
+            self.root.color = BLACK
+
+    def _expose(self, handle):
+        root, black_height = handle
+        left, root, right = super()._expose(root)
+        black_height -= root.color == BLACK
+        return (left, black_height), root, (right, black_height)
+
+    def _join(self, left, node: BinaryNode, right):
+        """
+        Joins two red-black subtrees below node. node is linked red into the
+        spine of the subtree with the larger black height at the other one's
+        black height, red-red violations on the way back up are fixed by a
+        recoloring and a rotation, in O(|bh(left) - bh(right)| + 1).
+        """
+        (left, left_height), (right, right_height) = left, right
+        if left_height > right_height:
+            root = self._join_right(left, left_height, node, right, right_height)
+            if root.color == RED and not self._is_black(root.get_right_child()):
+                root.color = BLACK
+                return root, left_height + 1
+            return root, left_height
+        if left_height < right_height:
+            root = self._join_left(left, left_height, node, right, right_height)
+            if root.color == RED and not self._is_black(root.get_left_child()):
+                root.color = BLACK
+                return root, right_height + 1
+            return root, right_height
+        if self._is_black(left) and self._is_black(right):
+            node.color = RED
+            return node.relink(left, right), left_height
+        node.color = BLACK
+        return node.relink(left, right), left_height + 1
+
+    def _join_right(self, left, left_height, node, right, right_height):
+        if self._is_black(left) and left_height == right_height:
+            node.color = RED
+            return node.relink(left, right)
+        inner_height = left_height - (left.color == BLACK)
+        subtree = self._join_right(left.right, inner_height, node, right, right_height)
+        root = left.relink(left.left, subtree)
+        if (
+            left.color == BLACK
+            and subtree.color == RED
+            and not self._is_black(subtree.right)
+        ):
+            subtree.right.color = BLACK
+            return root.rotate_detached_left()
+        return root
+
+    def _join_left(self, left, left_height, node, right, right_height):
+        if self._is_black(right) and left_height == right_height:
+            node.color = RED
+            return node.relink(left, right)
+        inner_height = right_height - (right.color == BLACK)
+        subtree = self._join_left(left, left_height, node, right.left, inner_height)
+        root = right.relink(subtree, right.right)
+        if (
+            right.color == BLACK
+            and subtree.color == RED
+            and not self._is_black(subtree.left)
+        ):
+            subtree.left.color = BLACK
+            return root.rotate_detached_right()
+        return root
 
     def _restructure(self, node: BinaryNode | None) -> None:
         if node is None:
             return
         parent = node.get_parent()
         grandparent = parent.get_parent() if parent is not None else None
-        while (
-            parent is not None
-            and parent.get_color() == "red"
-            and grandparent is not None
-        ):
+        while parent is not None and parent.color == RED and grandparent is not None:
             uncle = (
                 grandparent.get_left_child()
                 if grandparent.get_right_child() == parent
                 else grandparent.get_right_child()
             )
-            if uncle is not None and uncle.get_color() == "red":
-                uncle.set_color("black")
-                parent.set_color("black")
-                grandparent.set_color("red")
+            if uncle is not None and uncle.color == RED:
+                uncle.color = BLACK
+                parent.color = BLACK
+                grandparent.color = RED
                 node = grandparent
             else:
                 if grandparent.get_left_child() == parent:
@@ -64,7 +287,7 @@ class RBTree(BinaryTree):
             grandparent = parent.get_parent() if parent is not None else None
         root = self.get_root()
         if root is not None:
-            root.set_color("black")
+            root.color = BLACK
 
     def __str__(self) -> str:
         if self.root is None:
@@ -73,7 +296,7 @@ class RBTree(BinaryTree):
         def _node_str(node: BinaryNode, prefix: str = "", is_left: bool = True) -> str:
             if node is None:
                 return ""
-            color = "(R)" if node.get_color() == "red" else "(B)"
+            color = "(R)" if node.color == RED else "(B)"
             res = (
                 prefix
                 + ("├── " if is_left else "└── ")
@@ -92,7 +315,7 @@ class RBTree(BinaryTree):
                     )
             return res
 
-        root_color = "(R)" if self.root.get_color() == "red" else "(B)"
+        root_color = "(R)" if self.root.color == RED else "(B)"
         s = f"Root: {self.root.get_value()}{root_color}\n"
         left = self.root.get_left_child()
         right = self.root.get_right_child()
@@ -1,5 +1,6 @@
 from RBTree import RBTree
-from BinaryTree import BinaryNode
+from BinaryTree import BLACK, RED, BinaryNode
+import random
 
 
 def sample_rbtree() -> RBTree:
@@ -170,6 +171,21 @@ def test_node_color_set_and_get():
     assert node.get_color() == "black"
 
 
+def test_node_color_is_stored_as_int():
+    node = BinaryNode(10)
+    node.set_color("red")
+    assert node.color == RED
+    node.swap_color()
+    assert node.color == BLACK and node.get_color() == "black"
+    node.set_color(RED)
+    assert node.get_color() == "red"
+    try:
+        node.set_color("blue")
+        assert False, "Unknown colors should be rejected"
+    except ValueError:
+        pass
+
+
 def test_black_height_increases_correctly():
     tree = RBTree()
     tree.insert(10)
@@ -183,6 +199,175 @@ def test_black_height_increases_correctly():
     assert new_height >= old_height
 
 
+def test_cached_heights_after_rotations():
+    tree = RBTree()
+    for v in random.Random(6).sample(range(1000), 300):
+        tree.insert(v)
+
+    def check_height(node) -> int:
+        if node is None:
+            return 0
+        height = 1 + max(
+            check_height(node.get_left_child()), check_height(node.get_right_child())
+        )
+        assert node.get_height() == height, f"Stale height at {node}"
+        return height
+
+    check_height(tree.get_root())
+    ordered = [node.get_value() for node in tree.inorder_nodes()]
+    assert len(tree) == 300
+    assert [tree.select(k).get_value() for k in range(300)] == ordered
+
+
+def black_height(node) -> int:
+    """
+    Checks the red-black properties below node, returns its black height.
+    """
+    if node is None:
+        return 1
+    left = black_height(node.get_left_child())
+    right = black_height(node.get_right_child())
+    assert left == right, f"Black heights differ below {node}"
+    if node.get_color() == "red":
+        for child in (node.get_left_child(), node.get_right_child()):
+            assert child is None or child.get_color() == "black"
+    return left + (node.get_color() == "black")
+
+
+def test_from_sorted_and_bulk_insert():
+    for n in [0, 1, 2, 3, 7, 8, 100, 1023]:
+        tree = RBTree.from_sorted(range(n))
+        assert len(tree) == n
+        if n:
+            assert tree.get_root().get_color() == "black"
+        black_height(tree.get_root())
+
+    tree = RBTree.from_sorted(range(0, 300, 3))
+    assert tree.bulk_insert([1, 2]) == 2
+    black_height(tree.get_root())
+    assert tree.bulk_insert(range(300)) == 198
+    black_height(tree.get_root())
+    for v in [1000, -1, 150.5]:
+        tree.insert(v)
+    black_height(tree.get_root())
+    assert len(tree) == 303
+
+
+def test_remove_keeps_invariants():
+    rng = random.Random(7)
+    tree = RBTree()
+    values = set()
+    for step in range(3000):
+        value = rng.randint(0, 400)
+        if value in values:
+            tree.remove(value)
+            values.discard(value)
+        else:
+            tree.insert(value)
+            values.add(value)
+        if step % 50 == 0:
+            tree.validate()
+            # Height of a red-black tree is at most 2 log2(n + 1)
+            root = tree.get_root()
+            bound = 2 * (len(values) + 1).bit_length()
+            assert root is None or root.get_height() <= bound
+    tree.validate()
+    assert [n.get_value() for n in tree.inorder_nodes()] == sorted(values)
+    assert len(tree) == len(values)
+
+    for value in sorted(values):
+        tree.remove(value)
+        tree.validate()
+    assert tree.get_root() is None
+
+
+def test_validate_detects_violations():
+    tree = RBTree.from_sorted(range(15))
+    assert tree.validate() == 4
+
+    node = tree.binary_search(3)
+    node.set_color("red")
+    try:
+        tree.validate()
+        assert False, "Unequal black heights should be reported"
+    except ValueError:
+        pass
+
+    tree = RBTree()
+    for v in [2, 1, 3]:
+        tree.insert(v)
+    tree.get_root().set_color("red")
+    try:
+        tree.validate()
+        assert False, "Red root should be reported"
+    except ValueError:
+        pass
+
+
+def test_join_split_and_set_operations():
+    rng = random.Random(10)
+
+    def random_tree(values):
+        tree = RBTree()
+        for value in rng.sample(sorted(values), len(values)):
+            tree.insert(value)
+        return tree
+
+    def check(tree, values):
+        tree.validate()
+        assert [n.get_value() for n in tree.inorder_nodes()] == sorted(values)
+        assert len(tree) == len(values)
+
+    for _ in range(50):
+        a = set(rng.sample(range(400), rng.randint(0, 150)))
+        b = set(rng.sample(range(400), rng.randint(0, 150)))
+        check(random_tree(a).union(random_tree(b)), a | b)
+        check(random_tree(a).intersection(random_tree(b)), a & b)
+        check(random_tree(a).difference(random_tree(b)), a - b)
+
+        key = rng.randrange(400)
+        left, found, right = random_tree(a).split(key)
+        assert found == (key in a)
+        check(left, {v for v in a if v < key})
+        check(right, {v for v in a if v > key})
+
+    for low, high in [(0, 1), (1, 2000), (1990, 2000)]:
+        left = RBTree.from_sorted(range(low))
+        right = RBTree.from_sorted(range(low + 1, high))
+        joined = RBTree.join(left, low, right, consume=True)
+        check(joined, range(high))
+        assert left.get_root() is None and right.get_root() is None
+        joined.insert(high)
+        joined.remove(low)
+        joined.validate()
+
+    # With consume=False the operands are copied, colors included
+    first, second = random_tree(range(0, 300, 2)), random_tree(range(0, 300, 3))
+    colors = [(n.get_value(), n.get_color()) for n in first.preorder_nodes()]
+    check(first.intersection(second, consume=False), set(range(0, 300, 6)))
+    left, found, right = first.split(100, consume=False)
+    assert found
+    check(left, range(0, 100, 2))
+    assert [(n.get_value(), n.get_color()) for n in first.preorder_nodes()] == colors
+    check(first, range(0, 300, 2))
+    check(second, range(0, 300, 3))
+
+
+def test_parallel_set_operations():
+    rng = random.Random(12)
+    first = set(rng.sample(range(6000), 2500))
+    second = set(rng.sample(range(6000), 2000))
+    union = RBTree.from_sorted(sorted(first)).parallel_union(
+        RBTree.from_sorted(sorted(second)), max_workers=2, threshold=200
+    )
+    common = RBTree.from_sorted(sorted(first)).parallel_intersection(
+        RBTree.from_sorted(sorted(second)), max_workers=2, threshold=200
+    )
+    for tree, values in [(union, first | second), (common, first & second)]:
+        tree.validate()
+        assert [n.get_value() for n in tree.inorder_nodes()] == sorted(values)
+
+
 def textbook_example_test():
     tree = RBTree()
     values = [16, 29, 18, 34, 26, 15, 45, 33, 6, 37, 49, 48, 40]
@@ -204,7 +389,14 @@ def main():
     test_balancing_after_zigzag_rotation()
     test_uncle_red_case()
     test_node_color_set_and_get()
+    test_node_color_is_stored_as_int()
     test_black_height_increases_correctly()
+    test_cached_heights_after_rotations()
+    test_from_sorted_and_bulk_insert()
+    test_remove_keeps_invariants()
+    test_validate_detects_violations()
+    test_join_split_and_set_operations()
+    test_parallel_set_operations()
     textbook_example_test()
 
 